@@ -8,9 +8,10 @@ navigating through the application steps, and submitting the form.
 import asyncio
 import logging
 import json
-from typing import Callable, Awaitable, Tuple
+import time
 
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from workday_automation.login_handler import login_to_workday
 from workday_automation.steps.step1_my_information import fill_my_information
@@ -21,105 +22,167 @@ from workday_automation.steps.step5_self_identify import fill_self_identify
 from workday_automation.steps.step6_review_submit import submit_review
 from utils.extractor import extract_all_steps_sequentially
 from utils.parser import CONFIG
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("workday_auto_apply.log"),
-        logging.StreamHandler()
-    ]
+from utils.screenshots import flush_screenshots, set_run_label
+
+# Configure logging once for the whole application; library modules only create loggers.
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("workday_auto_apply.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+# Resource types the automation never needs. Stylesheets are kept on purpose:
+# visibility checks (listbox open/closed, is_visible) depend on computed styles.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "texttrack"}
+
+# Analytics/telemetry and beacon hosts. Their periodic requests keep "networkidle" from settling.
+BLOCKED_URL_PARTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "nr-data.net",
+    "newrelic.com",
+    "segment.io",
+    "clarity.ms",
+    "bat.bing.com",
+    "px.ads.linkedin.com",
+    "facebook.com/tr",
 )
 
+# Per-step bounds. Playwright's 30 s default made a missing element stall a step for
+# minutes; step actions get short defaults and the whole step a wall-clock budget.
+STEP_ACTION_TIMEOUT_MS = 5000
+STEP_NAVIGATION_TIMEOUT_MS = 10000
+STEP_BUDGET_SECONDS = 60
+# Workday pages that keep polling never reach "networkidle"; wait this long at most
+NETWORK_IDLE_TIMEOUT_MS = 5000
+
+
+async def _abort_heavy_resources(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def wait_for_network_idle(page: Page) -> None:
+    """Give the page a short chance to go idle; a page that keeps polling is not an error."""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        logging.debug("Network did not go idle within %s ms - continuing.", NETWORK_IDLE_TIMEOUT_MS)
+
+
+async def block_heavy_resources(context: BrowserContext) -> None:
+    """Abort image/font/media and analytics requests for every page in the context."""
+    await context.route("**/*", _abort_heavy_resources)
 
-async def run_step(step_fn: Callable[[Page], Awaitable[bool]], page: Page, step_name: str) -> bool:
+
+async def apply_one(browser: Browser, config: dict, run_label: str = "") -> bool:
     """
-    Runs a single step of the application process, with logging and error handling.
+    Runs one complete application in its own browser context.
 
     Args:
-        step_fn: The async function for the step to be executed.
-        page: The Playwright Page object.
-        step_name: The name of the step for logging purposes.
+        browser: Shared browser instance.
+        config: Configuration for this application (job_url may differ per job).
+        run_label: Suffix for files written by this run, so concurrent runs don't collide.
 
     Returns:
-        True if the step was successful, False otherwise.
+        True if every step completed, False otherwise.
     """
-    logging.info(f"--- Starting: {step_name} ---")
+    set_run_label(run_label)
+    context = await browser.new_context()
+    await block_heavy_resources(context)
+    page = await context.new_page()
+
     try:
-        if await step_fn(page, CONFIG):
-            logging.info(f"--- Completed: {step_name} ---")
-            return True
-        else:
-            logging.error(f"--- Failed: {step_name} ---")
+        if not await login_to_workday(page, config):
+            logging.critical("Login failed for %s.", config["job_url"])
             return False
+
+        await wait_for_network_idle(page)
+
+        # Optional: Extract form data for debugging/analysis
+        print("[INFO] Starting full application form extraction...")
+        all_step_data = await extract_all_steps_sequentially(page)
+
+        print("[SUCCESS] Form data extracted:")
+        print(json.dumps(all_step_data, indent=2))
+
+        with open(f"extracted_form_data{run_label}.json", "w", encoding="utf-8") as f:
+            json.dump(all_step_data, f, indent=2, ensure_ascii=False)
+
+        # Define all steps to run dynamically
+        steps = [
+            ("Step 1: My Information", fill_my_information),
+            ("Step 2: My Experience", fill_my_experience),
+            ("Step 3: Application Questions", fill_application_questions),
+            ("Step 4: Voluntary Disclosures", fill_voluntary_disclosures),
+            ("Step 5: Self Identification", fill_self_identify),
+            ("Step 6: Review & Submit", submit_review)
+        ]
+
+        # Run all steps dynamically
+        for step_name, step_function in steps:
+            print(f"[INFO] Starting {step_name}...")
+
+            if not await run_step(step_function, page, step_name, config):
+                logging.error(f"❌ Failed to complete {step_name}.")
+                logging.error(f"Stopping process due to failure in {step_name}.")
+                return False
+
+            logging.info(f"✅ {step_name} completed successfully.")
+            # No fixed delay here: run_step waits for networkidle before the next step
+
+        logging.info("🎉🎉🎉 Job application completed successfully: %s 🎉🎉🎉", config["job_url"])
+        return True
+
     except Exception as e:
-        logging.critical(f"An unexpected exception occurred in {step_name}: {e}", exc_info=True)
-        await page.screenshot(path=f"{step_name.replace(' ', '_').lower()}_exception.png")
+        logging.error(f"An error occurred during the application process: {str(e)}")
+        logging.error("Traceback:", exc_info=True)
         return False
 
+    finally:
+        # Let any failure screenshots finish before their pages go away
+        await flush_screenshots()
+        await context.close()
+
 
 async def main():
-    """Main function to run the entire Workday application process."""
+    """
+    Main function to run the Workday application process.
+
+    `job_urls` in the config (falling back to the single `job_url`) lists the jobs to apply to.
+    They share one browser and run concurrently in separate contexts, at most
+    `max_parallel_applications` at a time.
+    """
+    job_urls = CONFIG.get("job_urls") or [CONFIG["job_url"]]
+    limit = asyncio.Semaphore(CONFIG.get("max_parallel_applications", 3))
+
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=CONFIG.get('headless', True))
-        context = await browser.new_context()
-        page = await context.new_page()
+
+        async def apply_limited(index: int, job_url: str) -> bool:
+            async with limit:
+                run_label = f"_{index}" if len(job_urls) > 1 else ""
+                return await apply_one(browser, {**CONFIG, "job_url": job_url}, run_label)
 
         try:
-            if not await login_to_workday(page, CONFIG):
-                logging.critical("Login failed. Exiting automation.")
-                return
-            
-            await page.wait_for_load_state("networkidle")
-            await page.wait_for_timeout(2000)
-            
-            # Optional: Extract form data for debugging/analysis
-            print("[INFO] Starting full application form extraction...")
-            all_step_data = await extract_all_steps_sequentially(page)
-            
-            print("[SUCCESS] Form data extracted:")
-            print(json.dumps(all_step_data, indent=2))
-            
-            with open("extracted_form_data.json", "w", encoding="utf-8") as f:
-                json.dump(all_step_data, f, indent=2, ensure_ascii=False)
-            
-            # Define all steps to run dynamically
-            steps = [
-                ("Step 1: My Information", fill_my_information),
-                ("Step 2: My Experience", fill_my_experience),
-                ("Step 3: Application Questions", fill_application_questions),
-                ("Step 4: Voluntary Disclosures", fill_voluntary_disclosures),
-                ("Step 5: Self Identification", fill_self_identify),
-                ("Step 6: Review & Submit", submit_review)
-            ]
-
-            # Run all steps dynamically
-            for step_name, step_function in steps:
-                print(f"[INFO] Starting {step_name}...")
-                
-                if not await run_step(step_function, page, step_name):
-                    logging.error(f"❌ Failed to complete {step_name}.")
-                    logging.error(f"Stopping process due to failure in {step_name}.")
-                    return
-                
-                logging.info(f"✅ {step_name} completed successfully.")
-                
-                # Add a small delay between steps for stability
-                await page.wait_for_timeout(1000)
-
-            logging.info("🎉🎉🎉 Job application process completed successfully! 🎉🎉🎉")
-
-        except Exception as e:
-            logging.error(f"An error occurred during the application process: {str(e)}")
-            logging.error("Traceback:", exc_info=True)
-            
+            results = await asyncio.gather(*(apply_limited(i, url) for i, url in enumerate(job_urls, 1)))
+            logging.info("Applications completed: %s/%s", sum(results), len(results))
+
         finally:
             await browser.close()
             logging.info("Browser closed.")
 
 
-async def run_step(step_function, page, step_name):
+async def run_step(step_function, page, step_name, config=CONFIG):
     """
     Generic function to run a step with error handling and logging.
     
@@ -127,16 +190,21 @@ async def run_step(step_function, page, step_name):
         step_function: The async function to execute for this step
         page: Playwright page object
         step_name: Name of the step for logging purposes
+        config: Configuration of the application this page belongs to
         
     Returns:
         bool: True if step completed successfully, False otherwise
     """
+    page.set_default_timeout(STEP_ACTION_TIMEOUT_MS)
+    page.set_default_navigation_timeout(STEP_NAVIGATION_TIMEOUT_MS)
+    started = time.perf_counter()
     try:
-        # Wait for page to be ready
-        await page.wait_for_load_state("networkidle")
-        
-        # Execute the step function
-        result = await step_function(page, CONFIG)
+        async with asyncio.timeout(STEP_BUDGET_SECONDS):
+            # Wait for page to be ready
+            await wait_for_network_idle(page)
+            
+            # Execute the step function
+            result = await step_function(page, config)
         
         if result:
             logging.info(f"✅ {step_name} executed successfully.")
@@ -145,10 +213,15 @@ async def run_step(step_function, page, step_name):
             logging.error(f"❌ {step_name} returned False - step failed.")
             return False
             
+    except TimeoutError:
+        logging.error("❌ %s exceeded its %ss budget - step failed.", step_name, STEP_BUDGET_SECONDS)
+        return False
     except Exception as e:
         logging.error(f"❌ Exception in {step_name}: {str(e)}")
         logging.error("Traceback:", exc_info=True)
         return False
+    finally:
+        logging.info("⏱️ %s took %.1fs", step_name, time.perf_counter() - started)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Batched DOM reads and writes for plain text inputs and checkboxes.
+
+Filling fields one by one costs a Playwright round-trip per field. For simple
+<input>/<textarea> elements the write itself is trivial, so the values are set
+in a single page.evaluate call using the native value setter (so React-managed
+inputs pick up the change) followed by input/change/blur events. Checkboxes are
+clicked in-page when their state differs, since React listens for the click.
+
+The current state of many fields can likewise be read in one call, so callers
+can skip writes that would not change anything.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+_BULK_FILL_JS = """
+(pairs) => {
+    const missing = [];
+    for (const [id, val] of pairs) {
+        const el = document.getElementById(id);
+        if (!el) { missing.push(id); continue; }
+        if (typeof val === 'boolean') {
+            if (el.checked !== val) el.click();
+            continue;
+        }
+        const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+        setter.call(el, val);
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+        el.dispatchEvent(new Event('blur', { bubbles: true }));
+    }
+    return missing;
+}
+"""
+
+
+_FIELD_STATES_JS = """
+(ids) => Object.fromEntries(ids.map(id => {
+    const el = document.getElementById(id);
+    return [id, el ? { value: el.value ?? null, checked: el.checked ?? null, text: (el.innerText || '').trim() } : null];
+}))
+"""
+
+
+async def read_field_states(page: Page, ids: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Reads value, checked state and visible text of every id in one browser round-trip.
+
+    Returns:
+        {id: {"value", "checked", "text"}}, or None for ids not in the DOM.
+    """
+    if not ids:
+        return {}
+    return await page.evaluate(_FIELD_STATES_JS, list(ids))
+
+
+def state_matches(state: Optional[Dict[str, Any]], field_type: str, value: Any) -> bool:
+    """
+    True when a state from read_field_states already holds value, so writing it would be a no-op.
+    Dropdown buttons are compared by their label text, case-insensitively.
+    """
+    if not state:
+        return False
+    if field_type == "checkbox":
+        return state["checked"] == (value is True or str(value).lower() in ("yes", "true", "1"))
+    if field_type in ("dropdown-button", "select"):
+        return state["text"].lower() == str(value).lower()
+    if field_type in ("text", "textarea"):
+        return state["value"] == str(value)
+    return False
+
+
+async def bulk_fill_text(page: Page, pairs: Sequence[Tuple[str, Union[str, bool]]]) -> List[str]:
+    """
+    Sets the value of every (element id, value) pair in one browser round-trip.
+
+    Args:
+        page: Playwright page object
+        pairs: (id, value) pairs for text-like inputs; a bool value sets a checkbox's checked state
+
+    Returns:
+        The ids that were not found in the DOM, so callers can fall back to locator.fill().
+    """
+    if not pairs:
+        return []
+
+    missing = await page.evaluate(
+        _BULK_FILL_JS,
+        [[field_id, value if isinstance(value, bool) else str(value)] for field_id, value in pairs],
+    )
+    if missing:
+        logger.warning("⚠️ Bulk fill could not find %s field(s): %s", len(missing), missing)
+    return missing
@@ -3,13 +3,17 @@ Improved form extraction module that properly handles dynamic sections like Work
 Fixed to properly distinguish between radio buttons and dropdown buttons.
 """
 
+import hashlib
+import json
 import logging
-from typing import Any, Callable, Coroutine, Dict, List, Set, TypedDict
+import os
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, List, Set, Tuple, TypedDict
 
 from playwright.async_api import Locator, Page
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 class FormField(TypedDict):
     """A dictionary representing a single form field."""
@@ -39,12 +43,48 @@ TIMEOUTS = {
 }
 ADD_BUTTON_SELECTOR = '[data-automation-id="add-button"]'
 
+# --- Schema cache ---
+# Field schemas are stable per tenant/step, so they are cached on disk and reused
+# by later applications to the same employer.
+SCHEMA_CACHE_PATH = Path("form_schema_cache.json")
+_schema_cache: Dict[str, List[FormField]] | None = None
+
+PAGE_FINGERPRINT_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), el => el.getAttribute('data-automation-id')).join('|')
+"""
+ALL_IDS_PRESENT_JS = "(ids) => ids.every(id => document.getElementById(id) !== null)"
+
+# Last extraction per page, reused until the form fields in the DOM change
+_page_fields: "weakref.WeakKeyDictionary[Page, Tuple[str, List[FormField]]]" = weakref.WeakKeyDictionary()
+
+# Installs (once per document) a MutationObserver that flags any added/removed form
+# field, then returns and clears the flag. A fresh document counts as changed.
+FORM_CHANGED_JS = """
+(selector) => {
+    const fresh = !window.__formFieldObserver;
+    if (fresh) {
+        const touchesForm = (nodes) => Array.from(nodes).some(
+            n => n.nodeType === 1 && (n.matches(selector) || n.querySelector(selector))
+        );
+        window.__formFieldObserver = new MutationObserver((mutations) => {
+            if (mutations.some(m => touchesForm(m.addedNodes) || touchesForm(m.removedNodes))) {
+                window.__formFieldsDirty = true;
+            }
+        });
+        window.__formFieldObserver.observe(document.body, { childList: true, subtree: true });
+    }
+    const changed = fresh || !!window.__formFieldsDirty;
+    window.__formFieldsDirty = false;
+    return changed;
+}
+"""
+
 async def get_form_field_containers(page: Page) -> List[Locator]:
     """Gets all form field container elements from the page."""
     try:
         return await page.locator(FORM_FIELD_SELECTOR).all()
     except Exception as e:
-        logging.error(f"Error getting form field containers: {e}")
+        logger.error(f"Error getting form field containers: {e}")
         return []
 
 
@@ -62,7 +102,7 @@ async def extract_application_steps(page: Page) -> List[Dict[str, Any]]:
                 "is_current_step": is_current
             })
     except Exception as e:
-        logging.error(f"[Step Extractor] Error: {e}")
+        logger.error(f"[Step Extractor] Error: {e}")
     return steps_data
 
 async def extract_all_form_fields(page: Page, exclude_dynamic_sections: bool = False) -> List[FormField]:
@@ -99,7 +139,7 @@ async def extract_all_form_fields(page: Page, exclude_dynamic_sections: bool = F
                     all_results.append(field)
                     seen_labels.add(field_key)
         except Exception as e:
-            logging.error(f"Error in extractor {extractor.__name__}: {e}")
+            logger.error(f"Error in extractor {extractor.__name__}: {e}")
 
     # Handle dynamic sections separately
     if not exclude_dynamic_sections:
@@ -111,10 +151,114 @@ async def extract_all_form_fields(page: Page, exclude_dynamic_sections: bool = F
                     all_results.append(field)
                     seen_labels.add(field_key)
         except Exception as e:
-            logging.error(f"Error in dynamic section extraction: {e}")
+            logger.error(f"Error in dynamic section extraction: {e}")
 
     return all_results
 
+def _load_schema_cache() -> Dict[str, List[FormField]]:
+    global _schema_cache
+    if _schema_cache is None:
+        try:
+            _schema_cache = json.loads(SCHEMA_CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _schema_cache = {}
+    return _schema_cache
+
+
+async def _schema_key(page: Page) -> str:
+    """Hash of the page URL (without query) and the form-field automation ids currently rendered."""
+    fingerprint = await page.evaluate(PAGE_FINGERPRINT_JS, FORM_FIELD_SELECTOR)
+    url = page.url.split("?", 1)[0]
+    return hashlib.sha1(f"{url}\n{fingerprint}".encode("utf-8")).hexdigest()
+
+
+async def _cached_static_fields(page: Page) -> List[FormField]:
+    """Base (non-dynamic) fields of the page, from the disk cache when the page is unchanged."""
+    cache = _load_schema_cache()
+    try:
+        key = await _schema_key(page)
+    except Exception as e:
+        logger.warning("Could not fingerprint page for schema cache: %s", e)
+        return await extract_all_form_fields(page, exclude_dynamic_sections=True)
+
+    cached = cache.get(key)
+    if cached:
+        ids = [field["id_of_input_component"] for field in cached if field["id_of_input_component"]]
+        if await page.evaluate(ALL_IDS_PRESENT_JS, ids):
+            logger.info("Using cached form schema (%s fields)", len(cached))
+            return cached
+        logger.info("Cached form schema is stale, re-extracting")
+
+    fields = await extract_all_form_fields(page, exclude_dynamic_sections=True)
+    if fields:
+        # Keep only the schema; current values belong to this application, not the next one
+        cache[key] = [{**field, "user_data_select_values": []} for field in fields]
+        try:
+            # Write a temp file and swap it in, so other runs never read a half-written cache
+            tmp_path = SCHEMA_CACHE_PATH.with_name(f"{SCHEMA_CACHE_PATH.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, SCHEMA_CACHE_PATH)
+        except OSError as e:
+            logger.warning("Could not write schema cache: %s", e)
+    return fields
+
+
+async def extract_all_form_fields_cached(page: Page, exclude_dynamic_sections: bool = False) -> List[FormField]:
+    """
+    Same as extract_all_form_fields, but reuses a schema cached on disk for an identical page.
+
+    Only the static part of the page is memoized. Dynamic sections (Work Experience,
+    Education, ...) only exist after clicking 'Add', so they are always extracted live
+    and merged in, exactly as extract_all_form_fields does.
+    """
+    fields = list(await _cached_static_fields(page))
+    if exclude_dynamic_sections:
+        return fields
+
+    seen = {f"{field['label']}_{field['id_of_input_component']}" for field in fields}
+    try:
+        for field in await extract_dynamic_section_fields(page):
+            field_key = f"{field['label']}_{field['id_of_input_component']}"
+            if field_key not in seen:
+                fields.append(field)
+                seen.add(field_key)
+    except Exception as e:
+        logger.error("Error in dynamic section extraction: %s", e)
+    return fields
+
+
+async def _form_changed(page: Page) -> bool:
+    try:
+        return await page.evaluate(FORM_CHANGED_JS, FORM_FIELD_SELECTOR)
+    except Exception as e:
+        logger.warning("Could not check form for changes: %s", e)
+        return True
+
+
+async def get_form_fields(page: Page) -> List[FormField]:
+    """
+    Form fields of the current page, extracted once and reused across calls.
+
+    The result is kept per page and re-extracted only when the URL changes or a
+    form field has been added/removed since the last extraction (tracked by a
+    MutationObserver), e.g. after clicking 'Add' or moving to the next step.
+    """
+    memo = _page_fields.get(page)
+    if not await _form_changed(page) and memo and memo[0] == page.url:
+        return list(memo[1])
+
+    fields = await extract_all_form_fields_cached(page)
+    # Extraction itself opens dynamic sections; don't count those changes against the new result
+    await _form_changed(page)
+    _page_fields[page] = (page.url, fields)
+    return list(fields)
+
+
+def invalidate_form_fields(page: Page) -> None:
+    """Drop the memoized fields for this page so the next get_form_fields() re-extracts."""
+    _page_fields.pop(page, None)
+
+
 async def extract_dynamic_section_fields(page: Page) -> List[FormField]:
     """
     Clicks 'Add' in dynamic sections and extracts nested fields.
@@ -130,7 +274,7 @@ async def extract_dynamic_section_fields(page: Page) -> List[FormField]:
             try:
                 section_id = await header.get_attribute("id")
                 section_title = (await header.inner_text()).strip()
-                logging.info(f"[{section_title}] Processing section...")
+                logger.info(f"[{section_title}] Processing section...")
 
                 if not section_id:
                     continue
@@ -153,16 +297,35 @@ async def extract_dynamic_section_fields(page: Page) -> List[FormField]:
                     section_fields = await extract_section_specific_fields(page, section_container, section_title)
                     sectioned_results.extend(section_fields)
                     
-                    logging.info(f"[{section_title}] Extracted {len(section_fields)} fields")
+                    logger.info(f"[{section_title}] Extracted {len(section_fields)} fields")
 
             except Exception as e:
-                logging.error(f"[{section_title}] Error: {e}")
+                logger.error(f"[{section_title}] Error: {e}")
 
     except Exception as e:
-        logging.error(f"[extract_dynamic_section_fields] Error: {e}")
+        logger.error(f"[extract_dynamic_section_fields] Error: {e}")
 
     return sectioned_results
 
+async def extract_new_entry_fields(page: Page, section: str, entry_number: int) -> List[FormField]:
+    """
+    Clicks 'Add' in a repeatable section and extracts only the newly added entry panel,
+    instead of re-extracting the whole page after every add.
+
+    Args:
+        page: Playwright page object
+        section: Section id prefix as used in the DOM, e.g. "Work-Experience" or "Education"
+        entry_number: 1-based number of the new entry (its panel is "{section}-{n}-panel")
+    """
+    section_container = page.locator(f'div[role="group"][aria-labelledby="{section}-section"]')
+    await section_container.locator(ADD_BUTTON_SELECTOR).first.click()
+    invalidate_form_fields(page)
+
+    panel = page.locator(f"div[aria-labelledby='{section}-{entry_number}-panel']")
+    await panel.wait_for(state="visible", timeout=TIMEOUTS["page_wait"])
+    return await extract_section_specific_fields(page, panel, section.replace("-", " "))
+
+
 async def extract_section_specific_fields(page: Page, section_container: Locator, section_name: str) -> List[FormField]:
     """
     Extract fields specifically from within a section container.
@@ -217,7 +380,7 @@ async def extract_section_specific_fields(page: Page, section_container: Locator
                 fields.append(field)
                 
     except Exception as e:
-        logging.error(f"Error extracting section fields: {e}")
+        logger.error(f"Error extracting section fields: {e}")
     
     return fields
 
@@ -325,7 +488,7 @@ async def extract_single_file_upload_field(container: Locator, file_upload_el: L
             file_name = await file_item.inner_text()
             if file_name.strip():
                 uploaded_files.append(file_name.strip())
-        except:
+        except Exception:
             continue
     
     return {
@@ -431,7 +594,7 @@ async def extract_textarea_fields(page: Page) -> List[FormField]:
                     field["section_name"] = "main"
                     results.append(field)
     except Exception as e:
-        logging.error(f"Error extracting textarea fields: {e}")
+        logger.error(f"Error extracting textarea fields: {e}")
     
     return results
 
@@ -484,7 +647,7 @@ async def extract_file_upload_fields(page: Page) -> List[FormField]:
                         file_name = await file_item.inner_text()
                         if file_name.strip():
                             uploaded_files.append(file_name.strip())
-                    except:
+                    except Exception:
                         continue
                 
                 results.append({
@@ -498,11 +661,11 @@ async def extract_file_upload_fields(page: Page) -> List[FormField]:
                 })
                 
             except Exception as e:
-                logging.error(f"[File Upload #{idx}] Error: {e}")
+                logger.error(f"[File Upload #{idx}] Error: {e}")
                 continue
                 
     except Exception as e:
-        logging.error(f"Error extracting file upload fields: {e}")
+        logger.error(f"Error extracting file upload fields: {e}")
     
     return results
 
@@ -527,19 +690,19 @@ async def extract_all_steps_sequentially(page: Page) -> Dict[str, List[FormField
         for step in steps:
             step_name = step["step_name"]
             is_current = step["is_current_step"]
-            logging.info(f"[STEP] Found: {step_name} | Current: {is_current}")
+            logger.info(f"[STEP] Found: {step_name} | Current: {is_current}")
 
             if is_current:
-                logging.info(f"→ Extracting data for current step: {step_name}")
+                logger.info(f"→ Extracting data for current step: {step_name}")
                 form_data = await extract_all_form_fields(page)
                 all_step_data[step_name] = form_data
-                logging.info(f"→ Extracted {len(form_data)} fields from step: {step_name}")
+                logger.info(f"→ Extracted {len(form_data)} fields from step: {step_name}")
             else:
                 all_step_data[step_name] = []
 
         return all_step_data
     except Exception as e:
-        logging.error(f"Error in extract_all_steps_sequentially: {e}")
+        logger.error(f"Error in extract_all_steps_sequentially: {e}")
         return {}
 
 async def extract_date_fields(page: Page) -> List[FormField]:
@@ -556,7 +719,7 @@ async def extract_date_fields(page: Page) -> List[FormField]:
                     field["section_name"] = "main"
                     results.append(field)
     except Exception as e:
-        logging.error(f"Error extracting date fields: {e}")
+        logger.error(f"Error extracting date fields: {e}")
     
     return results
 
@@ -567,7 +730,7 @@ async def extract_multiselect_fields(page: Page) -> List[FormField]:
     try:
         containers = await page.locator(MULTI_SELECT_CONTAINER_SELECTOR).all()
         if not containers:
-            logging.warning("⚠️ No multi-select containers found.")
+            logger.warning("⚠️ No multi-select containers found.")
             return results
 
         for idx, container in enumerate(containers):
@@ -589,7 +752,6 @@ async def extract_multiselect_fields(page: Page) -> List[FormField]:
                 if await dropdown_button.count() > 0:
                     await dropdown_button.click()
                     await page.wait_for_selector(PICKLIST_OPTION_SELECTOR, timeout=TIMEOUTS["element_wait"])
-                    await page.wait_for_timeout(TIMEOUTS["animation_wait"])
                     all_options = await page.locator(PICKLIST_OPTION_SELECTOR).all_inner_texts()
                     await dropdown_button.click()  # Close dropdown
 
@@ -603,9 +765,9 @@ async def extract_multiselect_fields(page: Page) -> List[FormField]:
                     "section_name": "main"
                 })
             except Exception as e:
-                logging.error(f"[MultiSelect #{idx}] Error: {e}")
+                logger.error(f"[MultiSelect #{idx}] Error: {e}")
     except Exception as e:
-        logging.error(f"❌ Error extracting multiselect fields: {e}")
+        logger.error(f"❌ Error extracting multiselect fields: {e}")
 
     return results
 
@@ -621,7 +783,7 @@ async def extract_radio_fields(page: Page) -> List[FormField]:
                 # IMPORTANT: Skip fieldsets that contain dropdown buttons
                 dropdown_button = fieldset.locator(DROPDOWN_TRIGGER_SELECTOR)
                 if await dropdown_button.count() > 0:
-                    logging.info(f"[Radio #{idx}] Skipping fieldset with dropdown button")
+                    logger.info(f"[Radio #{idx}] Skipping fieldset with dropdown button")
                     continue
                 
                 # Only process fieldsets with actual radio buttons
@@ -667,9 +829,9 @@ async def extract_radio_fields(page: Page) -> List[FormField]:
                     "section_name": "main"
                 })
             except Exception as e:
-                logging.error(f"[Radio #{idx}] Error: {e}")
+                logger.error(f"[Radio #{idx}] Error: {e}")
     except Exception as e:
-        logging.error(f"Error extracting radio fields: {e}")
+        logger.error(f"Error extracting radio fields: {e}")
 
     return results
 
@@ -694,23 +856,22 @@ async def extract_button_dropdown_fields(page: Page) -> List[FormField]:
                 # Extract dropdown options by clicking
                 try:
                     await button.click()
-                    await page.wait_for_timeout(TIMEOUTS["animation_wait"])
                     option_locator = page.locator('[role="listbox"] [role="option"], [data-automation-id="picklistOption"]')
                     await option_locator.first.wait_for(timeout=TIMEOUTS["element_wait"])
                     options = await option_locator.all_inner_texts()
                     await page.keyboard.press("Escape")
                     field["options"] = [opt.strip() for opt in options if opt.strip()]
                 except Exception as e:
-                    logging.warning(f"[Dropdown Button #{idx}] Could not extract options: {e}")
+                    logger.warning(f"[Dropdown Button #{idx}] Could not extract options: {e}")
                     field["options"] = []
 
                 field["section_name"] = "main"
                 results.append(field)
                 
             except Exception as e:
-                logging.error(f"[Dropdown Button #{idx}] Error: {e}")
+                logger.error(f"[Dropdown Button #{idx}] Error: {e}")
     except Exception as e:
-        logging.error(f"❌ Error extracting button dropdown fields: {e}")
+        logger.error(f"❌ Error extracting button dropdown fields: {e}")
 
     return results
 
@@ -747,10 +908,10 @@ async def extract_text_fields(page: Page) -> List[FormField]:
                 })
 
             except Exception as e:
-                logging.error(f"[Text Field #{idx}] Error: {e}")
+                logger.error(f"[Text Field #{idx}] Error: {e}")
 
     except Exception as e:
-        logging.error(f"Error extracting text fields: {e}")    
+        logger.error(f"Error extracting text fields: {e}")    
 
     return results
 
@@ -771,8 +932,8 @@ async def extract_checkbox_fields(page: Page) -> List[FormField]:
                     field["section_name"] = "main"
                     results.append(field)
             except Exception as e:
-                logging.error(f"[Checkbox #{idx}] Error: {e}")
+                logger.error(f"[Checkbox #{idx}] Error: {e}")
     except Exception as e:
-        logging.error(f"Error extracting checkbox fields: {e}")
+        logger.error(f"Error extracting checkbox fields: {e}")
     
     return results
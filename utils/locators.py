@@ -0,0 +1,43 @@
+"""
+Cached locators and listbox option lookups shared by the application steps.
+
+Locators are cached per page so repeated selectors (option lists, the listbox,
+retry/fallback branches) are built once and reused; the cache entry goes away
+with the page.
+"""
+
+import json
+import re
+import weakref
+from typing import Dict
+
+from playwright.async_api import Locator, Page
+
+_LOCATOR_CACHE: "weakref.WeakKeyDictionary[Page, Dict[str, Locator]]" = weakref.WeakKeyDictionary()
+
+
+def cached_locator(page: Page, selector: str) -> Locator:
+    """Return a cached page.locator(selector) for this page."""
+    cache = _LOCATOR_CACHE.setdefault(page, {})
+    if selector not in cache:
+        cache[selector] = page.locator(selector)
+    return cache[selector]
+
+
+def exact_text(value) -> re.Pattern:
+    """Whole-text match for Locator.filter(has_text=...), which otherwise matches substrings."""
+    return re.compile(rf"^\s*{re.escape(str(value))}\s*$")
+
+
+def option_locator(listbox: Locator, value) -> Locator:
+    """Option in listbox whose data-automation-label, or else whole text, equals value (CSS, no role scan)."""
+    return listbox.locator(f'[role="option"][data-automation-label={json.dumps(str(value))}]').or_(
+        listbox.locator('[role="option"]').filter(has_text=exact_text(value))
+    ).first
+
+
+async def open_listbox(page: Page) -> Locator:
+    """Wait for the listbox that was just opened and return it, so option queries stay inside it."""
+    listbox = cached_locator(page, '[role="listbox"]').last
+    await listbox.wait_for(state="visible", timeout=3000)
+    return listbox
@@ -2,6 +2,7 @@
 Handles loading of the YAML configuration file.
 """
 
+import functools
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,9 +10,63 @@ import yaml
 
 CONFIG_PATH = Path(__file__).parent.parent / "config" / "data.yml"
 
+# Step 2 entry values that are written into text inputs and must be strings
+_STEP2_STRING_KEYS = {
+    "work_experience": ("start_month", "start_year", "end_month", "end_year"),
+    "education": ("start_year", "end_year", "grade"),
+}
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("yes", "true", "1")
+    return bool(value)
+
+
+# Per-skill language ratings; any that are not given fall back to ``proficiency``
+_LANGUAGE_SKILLS = ("comprehension", "overall", "reading", "speaking", "writing")
+
+
+def _first(entry: Dict[str, Any], *keys: str, default: Any = "") -> Any:
+    """Value of the first key that is set, so alternative spellings resolve to one canonical key."""
+    for key in keys:
+        if entry.get(key):
+            return entry[key]
+    return default
+
+
+def _normalize_step2(config: Dict[str, Any]) -> None:
+    """Coerces step 2 entry values once at load time so the fill path can use them as-is.
+
+    ``currently_work_here`` becomes a real bool (a YAML string like "false" would
+    otherwise be truthy) and date/year/grade values become strings. Entries with
+    alternative key spellings or missing optional keys are rewritten to a single
+    canonical set of keys with their defaults filled in.
+    """
+    step2 = config.get("step2") or {}
+    for we in step2.get("work_experience") or []:
+        we["currently_work_here"] = _as_bool(we.get("currently_work_here", False))
+    for edu in step2.get("education") or []:
+        edu["school_option"] = _first(edu, "school_option", "school")
+        edu.setdefault("start_year", "2020")
+        edu.setdefault("end_year", "2024")
+    for section, keys in _STEP2_STRING_KEYS.items():
+        for entry in step2.get(section) or []:
+            for key in keys:
+                if entry.get(key) is not None:
+                    entry[key] = str(entry[key])
+    for lang in step2.get("languages") or []:
+        lang["native"] = _as_bool(_first(lang, "native", "fluent", default=False))
+        for skill in _LANGUAGE_SKILLS:
+            lang.setdefault(skill, lang.get("proficiency", ""))
+
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> Dict[str, Any]:
     """Loads the configuration from the data.yml file.
 
+    The file is parsed and normalized once; later calls return the same object.
+
     Returns:
         Dict[str, Any]: The configuration as a dictionary.
 
@@ -21,7 +76,11 @@ def load_config() -> Dict[str, Any]:
     if not CONFIG_PATH.is_file():
         raise FileNotFoundError(f"Configuration file not found at {CONFIG_PATH}")
     with open(CONFIG_PATH, "r") as f:
-        return yaml.safe_load(f)
+        # An empty file parses to None
+        config = yaml.safe_load(f) or {}
+    _normalize_step2(config)
+    return config
 
 
-CONFIG = load_config()
+# Shared by every step and never modified; per-run overrides go into a copy ({**CONFIG, ...})
+CONFIG: Dict[str, Any] = load_config()
@@ -0,0 +1,48 @@
+"""
+Non-blocking failure screenshots for the login flow and the application steps.
+
+A screenshot costs a few hundred milliseconds, which a failing step would
+otherwise spend before it can return, so captures are started as background
+tasks. Login and steps 1-3 always capture; captures marked debug_only (steps
+4-6) are taken only when WORKDAY_DEBUG_SCREENSHOTS=1.
+Call flush_screenshots() before closing the browser context so that pending
+captures can finish. Concurrent runs call set_run_label() so that their files
+don't overwrite each other.
+"""
+
+import asyncio
+import os
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Set
+
+from playwright.async_api import Page
+
+DEBUG_SCREENSHOTS = os.environ.get("WORKDAY_DEBUG_SCREENSHOTS") == "1"
+
+# Held here so in-flight captures are not garbage-collected
+_pending: Set["asyncio.Task[bytes]"] = set()
+
+# Suffix for this run's screenshot files; a context variable, so each concurrent task has its own
+_run_label: ContextVar[str] = ContextVar("screenshot_run_label", default="")
+
+
+def set_run_label(label: str) -> None:
+    """Suffix every screenshot taken from the current task (and tasks it starts) with label."""
+    _run_label.set(label)
+
+
+def capture_failure(page: Page, path: str, debug_only: bool = False) -> None:
+    """Start a background screenshot of page to path; debug_only captures need WORKDAY_DEBUG_SCREENSHOTS=1."""
+    if debug_only and not DEBUG_SCREENSHOTS:
+        return
+    target = Path(path)
+    target = target.with_name(f"{target.stem}{_run_label.get()}{target.suffix}")
+    task = asyncio.create_task(page.screenshot(path=target))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def flush_screenshots() -> None:
+    """Wait for every pending capture; failed captures are ignored."""
+    await asyncio.gather(*_pending, return_exceptions=True)
@@ -14,9 +14,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from playwright.async_api import Browser, ElementHandle, Page, async_playwright
 
 # --- Setup Logging ---
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
 
 # --- Constants ---
 COMPLETED_KEYWORDS = ["complete", "finished", "done", "past"]
@@ -55,7 +53,7 @@ class DynamicJobProgressExtractor:
 
     async def launch_browser(self, headless: bool = False) -> None:
         """Launches a Playwright browser instance and creates a new page."""
-        logging.info(f"Launching browser in {'headless' if headless else 'headed'} mode.")
+        logger.info(f"Launching browser in {'headless' if headless else 'headed'} mode.")
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(headless=headless)
         self.page = await self.browser.new_page()
@@ -63,12 +61,12 @@ class DynamicJobProgressExtractor:
     async def close_browser(self) -> None:
         """Closes the Playwright browser instance."""
         if self.browser:
-            logging.info("Closing browser.")
+            logger.info("Closing browser.")
             await self.browser.close()
 
     async def _find_progress_container(self, page: Page) -> Optional[ElementHandle]:
         """Finds the main container element for the progress steps."""
-        logging.debug("Attempting to find progress container.")
+        logger.debug("Attempting to find progress container.")
         for selector in PROGRESS_CONTAINER_SELECTORS:
             try:
                 container = await page.query_selector(selector)
@@ -77,10 +75,10 @@ class DynamicJobProgressExtractor:
                         'li, div[class*="step"], div[data-automation-id*="step"]'
                     )
                     if len(steps) > 1:
-                        logging.info(f"Found progress container with selector: {selector}")
+                        logger.info(f"Found progress container with selector: {selector}")
                         return container
             except Exception as e:
-                logging.warning(
+                logger.warning(
                     f"Error checking selector '{selector}': {e}"
                 )
                 continue
@@ -88,11 +86,11 @@ class DynamicJobProgressExtractor:
 
     async def _extract_step_elements(self, container: ElementHandle) -> List[ElementHandle]:
         """Extracts individual step elements from the progress container."""
-        logging.debug("Extracting step elements from container.")
+        logger.debug("Extracting step elements from container.")
         for selector in STEP_ELEMENT_SELECTORS:
             steps = await container.query_selector_all(selector)
             if len(steps) > 1:
-                logging.info(f"Found {len(steps)} step elements with selector: {selector}")
+                logger.info(f"Found {len(steps)} step elements with selector: {selector}")
                 return steps
         return []
 
@@ -116,7 +114,7 @@ class DynamicJobProgressExtractor:
             step_info["status"] = self._get_step_status(attributes, text_content)
 
         except Exception as e:
-            logging.error(f"Failed to analyze step element {index + 1}: {e}")
+            logger.error(f"Failed to analyze step element {index + 1}: {e}")
             step_info["error"] = str(e)
 
         return step_info
@@ -184,26 +182,26 @@ class DynamicJobProgressExtractor:
             }
 
         except Exception as e:
-            logging.critical(f"A critical error occurred during extraction: {e}")
+            logger.critical(f"A critical error occurred during extraction: {e}")
             return {"error": str(e)}
 
     @staticmethod
     def display_summary(progress_info: Dict[str, Any]) -> None:
         """Prints a formatted summary of the application progress."""
         if "error" in progress_info:
-            logging.error(f"Cannot display summary due to error: {progress_info['error']}")
+            logger.error(f"Cannot display summary due to error: {progress_info['error']}")
             return
 
-        logging.info("\n--- Job Application Progress ---")
-        logging.info(f"Total Steps: {progress_info['total_steps']}")
-        logging.info(f"Completed: {progress_info['completed_steps']}")
-        logging.info(f"Current Step: {progress_info['current_step_name']}")
-        logging.info("---------------------------------")
+        logger.info("\n--- Job Application Progress ---")
+        logger.info(f"Total Steps: {progress_info['total_steps']}")
+        logger.info(f"Completed: {progress_info['completed_steps']}")
+        logger.info(f"Current Step: {progress_info['current_step_name']}")
+        logger.info("---------------------------------")
 
         for step in progress_info["steps"]:
             icons = {"completed": "✅", "active": "🔄", "inactive": "⏳", "unknown": "❓"}
             status = step.get("status", "unknown")
-            logging.info(
+            logger.info(
                 f"{icons[status]} Step {step['step_number']}: {step['step_name']} ({status.upper()})"
             )
 
@@ -216,10 +214,10 @@ async def run_single_extraction(
     try:
         await extractor.launch_browser(headless=headless)
         if not extractor.page:
-            logging.error("Failed to create a page.")
+            logger.error("Failed to create a page.")
             return None
 
-        logging.info(f"Navigating to {url}")
+        logger.info(f"Navigating to {url}")
         await extractor.page.goto(url, wait_until="networkidle")
         await asyncio.sleep(2)  # Allow for dynamic content to load
 
@@ -228,7 +226,7 @@ async def run_single_extraction(
         return progress_data
 
     except Exception as e:
-        logging.critical(f"An error occurred during single extraction run: {e}")
+        logger.critical(f"An error occurred during single extraction run: {e}")
         return {"error": str(e)}
     finally:
         await extractor.close_browser()
@@ -237,10 +235,13 @@ async def run_single_extraction(
 async def main() -> None:
     """Main function to demonstrate the extractor's capabilities."""
     test_url = "https://nvidia.wd5.myworkdayjobs.com/en-US/NVIDIAExternalCareerSite/job/Senior-DevOps-Engineer_JR1997710/apply/applyManually"
-    logging.info(f"--- Running Dynamic Job Progress Extractor on: {test_url} ---")
+    logger.info(f"--- Running Dynamic Job Progress Extractor on: {test_url} ---")
 
     await run_single_extraction(test_url, headless=True)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
     asyncio.run(main())
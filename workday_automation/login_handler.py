@@ -1,129 +1,214 @@
 """
 Handles the login process for Workday job applications.
-Combines best practices from first sample with exact reference patterns from second sample.
+Opens the job page, signs in (or creates an account first) and clicks through to the application.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict
-from playwright.async_api import Page, TimeoutError
+import weakref
+from typing import Any, Dict, Tuple
+from playwright.async_api import Locator, Page, TimeoutError
 
 from utils.parser import CONFIG
+from utils.screenshots import capture_failure, flush_screenshots
 
 # --- Constants ---
-SIGN_IN_BUTTON = 'button:has-text("Sign In")'
-CREATE_ACCOUNT_BUTTON = 'button:has-text("Create Account")'
-APPLY_BUTTON = 'button:has-text("Apply")'
-APPLY_MANUALLY_BUTTON = 'button:has-text("Apply Manually")'
-
 EMAIL_LABEL = "Email Address"
 PASSWORD_LABEL = "Password"
 VERIFY_PASSWORD_LABEL = "Verify New Password"
 TERMS_CHECKBOX_SELECTOR = '[data-automation-id="createAccountCheckbox"]'
-INVALID_CREDENTIALS_SELECTOR = 'div[data-automation-id="errorBanner"]'
+INVALID_LOGIN_TEXT_SELECTOR = "text=Invalid"
+COOKIE_ACCEPT_SELECTOR = 'button[data-automation-id="legalNoticeAcceptButton"]'
 
 # Timeout constants
 TIMEOUTS = {
     "page_load": 30000,
     "button_click": 5000,
     "element_wait": 5000,
-    "network_idle": 15000
+    "network_idle": 15000,
+    "login_result": 10000,
+    "url_probe": 5000
 }
 
+# Per-page cache of CSS/role/label locators, dropped automatically with the page
+_LOCATOR_CACHE: "weakref.WeakKeyDictionary[Page, Dict[Tuple[str, str, bool], Locator]]" = weakref.WeakKeyDictionary()
+
+
+def _css(page: Page, selector: str) -> Locator:
+    """Return a cached ``page.locator`` for one of the selector constants above."""
+    cache = _LOCATOR_CACHE.setdefault(page, {})
+    key = ("css", selector, False)
+    if key not in cache:
+        cache[key] = page.locator(selector)
+    return cache[key]
+
+
+def _by_role(page: Page, role: str, name: str, exact: bool = False) -> Locator:
+    """Return a cached ``get_by_role`` locator for this page."""
+    cache = _LOCATOR_CACHE.setdefault(page, {})
+    key = ("role:" + role, name, exact)
+    if key not in cache:
+        cache[key] = page.get_by_role(role, name=name, exact=exact)
+    return cache[key]
+
+
+def _by_label(page: Page, label: str, exact: bool = True) -> Locator:
+    """Return a cached ``get_by_label`` locator for this page."""
+    cache = _LOCATOR_CACHE.setdefault(page, {})
+    key = ("label", label, exact)
+    if key not in cache:
+        cache[key] = page.get_by_label(label, exact=exact)
+    return cache[key]
+
+
+async def _exists(locator: Locator, ms: int = 1500) -> bool:
+    """Wait up to ``ms`` for the locator to become visible instead of a fixed sleep + probe."""
+    try:
+        await locator.first.wait_for(state="visible", timeout=ms)
+        return True
+    except TimeoutError:
+        return False
+
 
 async def _navigate_and_load_page(page: Page, config: Dict[str, Any]) -> bool:
     """Navigate to the job URL and handle page loading."""
     logging.info("🔐 Opening job URL …")
+
+    # Cheap HEAD probe so dead URLs fail in seconds instead of the full navigation timeout
     try:
-        await page.goto(config["job_url"], timeout=TIMEOUTS["page_load"])
-        return True
+        resp = await page.context.request.fetch(config["job_url"], method="HEAD", timeout=TIMEOUTS["url_probe"])
+        if resp.status in (404, 410):
+            logging.error("❌ Job page is gone (HTTP %s).", resp.status)
+            return False
+    except Exception as e:
+        # Timeouts and hosts that reject HEAD say nothing about the page; let the navigation decide
+        logging.warning("⚠️ HEAD probe failed (%s) – loading the page anyway.", e)
+
+    try:
+        await page.goto(config["job_url"], wait_until="domcontentloaded", timeout=TIMEOUTS["page_load"])
     except Exception as e:
-        logging.error(f"❌ Cannot load job page: {e}")
+        logging.error("❌ Cannot load job page: %s", e)
         return False
+
+    # Wait for an actionable element rather than every tracker reaching "load"
+    sentinel = _by_role(page, "button", "Sign In").or_(_by_role(page, "button", "Apply"))
+    try:
+        await sentinel.first.wait_for(timeout=TIMEOUTS["element_wait"])
+    except TimeoutError:
+        logging.warning("⚠️ Sign In / Apply button not visible yet – continuing.")
+    return True
     
 async def _accept_cookies_if_present(page: Page) -> None:
     """Clicks 'Accept Cookies' button if cookie banner is shown."""
     try:
-        await page.wait_for_timeout(1000)
-        accept_button = page.locator('button[data-automation-id="legalNoticeAcceptButton"]')
-        if await accept_button.is_visible(timeout=3000):
+        accept_button = _css(page, COOKIE_ACCEPT_SELECTOR)
+        if await _exists(accept_button, 3000):
             logging.info("🍪 Accepting cookies …")
             await accept_button.click()
             await page.wait_for_timeout(1000)
     except Exception as e:
-        logging.debug(f"⚠️ Cookie acceptance skipped or failed: {e}")
+        logging.debug("⚠️ Cookie acceptance skipped or failed: %s", e)
 
 
 async def _click_initial_sign_in(page: Page) -> bool:
     """Click the top-level Sign In button."""
     try:
         logging.info("➡️ Clicking top‑level Sign In …")
-        await page.get_by_role("button", name="Sign In").click(timeout=TIMEOUTS["button_click"])
-        await page.wait_for_timeout(1000)
+        await _by_role(page, "button", "Sign In").click(timeout=TIMEOUTS["button_click"])
         return True
     except TimeoutError:
         logging.error("❌ Top‑level Sign In button not found.")
         return False
 
 
+async def _login_rejected(page: Page) -> bool:
+    """Wait for either the invalid-credentials message or the sign-in form closing and report which won."""
+    # The Apply button is already visible behind the sign-in modal, so only the form going away means success
+    rejected = asyncio.create_task(
+        _css(page, INVALID_LOGIN_TEXT_SELECTOR).first.wait_for(state="visible", timeout=TIMEOUTS["login_result"])
+    )
+    signed_in = asyncio.create_task(
+        _by_label(page, PASSWORD_LABEL).first.wait_for(state="hidden", timeout=TIMEOUTS["login_result"])
+    )
+    done, pending = await asyncio.wait({rejected, signed_in}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    succeeded = {task for task in done if task.exception() is None}
+    if rejected in succeeded:
+        return True
+    if signed_in not in succeeded:
+        logging.warning("⚠️ No login outcome detected – assuming signed in.")
+    return False
+
+
+async def _submit_credentials(page: Page, config: Dict[str, Any]) -> bool:
+    """Fill the sign-in form, submit it and check whether the login was accepted."""
+    try:
+        logging.info("🔑 Filling login form …")
+        # One at a time: fill() types into whichever element has focus
+        await _by_label(page, EMAIL_LABEL).fill(config["email"])
+        await _by_label(page, PASSWORD_LABEL).fill(config["password"])
+        await _by_role(page, "button", "Sign In", exact=True).click()
+
+        # Race the error message against the sign-in form closing
+        if await _login_rejected(page):
+            logging.error("❌ Login rejected – invalid credentials.")
+            capture_failure(page, "login_invalid.png")
+            return False
+
+        logging.info("✅ Logged in.")
+        return True
+    except Exception as e:
+        logging.error("❌ Sign‑in step failed: %s", e)
+        capture_failure(page, "login_failed.png")
+        return False
+
+
 async def _perform_existing_account_login(page: Page, config: Dict[str, Any]) -> bool:
     """Handle login for existing accounts."""
-    if await page.get_by_role("button", name="Sign In").is_visible():
+    # The top-level Sign In click usually opens the form already; don't click through it twice
+    if await _by_label(page, EMAIL_LABEL).is_visible():
+        logging.info("🔄 Account exists – login form already open …")
+        return await _submit_credentials(page, config)
+
+    sign_in_btn = _by_role(page, "button", "Sign In")
+    if await _exists(sign_in_btn):
         logging.info("🔄 Account exists – signing in …")
-        await page.get_by_role("button", name="Sign In").click()
-        await page.wait_for_timeout(1000)
-        
-        try:
-            logging.info("🔑 Filling login form …")
-            await page.get_by_label(EMAIL_LABEL, exact=True).fill(config["email"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_label(PASSWORD_LABEL, exact=True).fill(config["password"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_role("button", name="Sign In", exact=True).click()
-            await page.wait_for_timeout(3000)
+        await sign_in_btn.click()
+        return await _submit_credentials(page, config)
 
-            # Check for login errors
-            if await page.locator("text=Invalid").first.is_visible():
-                logging.error("❌ Login rejected – invalid credentials.")
-                await page.screenshot(path="login_invalid.png")
-                return False
-
-            logging.info("✅ Logged in.")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Sign‑in step failed: {e}")
-            await page.screenshot(path="login_failed.png")
-            return False
-    
     return True  # No existing account login needed
 
 
+async def _accept_terms(page: Page) -> None:
+    """Check the 'I Agree' checkbox on the create-account form if present."""
+    try:
+        checkbox = _css(page, TERMS_CHECKBOX_SELECTOR)
+        if not await checkbox.is_checked():
+            await checkbox.check()
+        logging.info("✅ Checked 'I Agree' checkbox.")
+    except Exception as e:
+        logging.warning("⚠️ Could not check 'I Agree' checkbox: %s", e)
+
+
 async def _create_new_account(page: Page, config: Dict[str, Any]) -> bool:
     """Handle account creation process."""
     try:
-        if await page.get_by_role("button", name="Create Account").is_visible():
+        create_btn = _by_role(page, "button", "Create Account")
+        if await _exists(create_btn):
             logging.info("🆕 'Create Account' detected – creating new account …")
-            await page.get_by_role("button", name="Create Account").click()
-            await page.wait_for_timeout(1000)
+            await create_btn.click()
 
-            # Fill account creation form
-            await page.get_by_label(EMAIL_LABEL, exact=True).fill(config["email"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_label(PASSWORD_LABEL, exact=True).fill(config["password"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_label(VERIFY_PASSWORD_LABEL, exact=True).fill(config["password"])
-            await page.wait_for_timeout(1000)
-
-            # Handle terms checkbox if present
-            try:
-                checkbox = page.locator(TERMS_CHECKBOX_SELECTOR)
-                if not await checkbox.is_checked():
-                    await checkbox.check()
-                logging.info("✅ Checked 'I Agree' checkbox.")
-            except Exception as e:
-                logging.warning(f"⚠️ Could not check 'I Agree' checkbox: {e}")
+            # Fill account creation form one field at a time: fill() types into whichever element has focus
+            await _by_label(page, EMAIL_LABEL).fill(config["email"])
+            await _by_label(page, PASSWORD_LABEL).fill(config["password"])
+            await _by_label(page, VERIFY_PASSWORD_LABEL).fill(config["password"])
+            await _accept_terms(page)
 
             # Submit account creation
-            await page.get_by_role("button", name="Create Account", exact=True).click()
+            await _by_role(page, "button", "Create Account", exact=True).click()
             logging.info("⏳ Waiting for account creation …")
             await page.wait_for_timeout(3000)
 
@@ -131,8 +216,8 @@ async def _create_new_account(page: Page, config: Dict[str, Any]) -> bool:
             return await _handle_post_creation_signin(page, config)
             
     except Exception as e:
-        logging.error(f"❌ Account‑creation step failed: {e}")
-        await page.screenshot(path="create_account_failed.png")
+        logging.error("❌ Account‑creation step failed: %s", e)
+        capture_failure(page, "create_account_failed.png")
         return False
     
     return True
@@ -141,52 +226,45 @@ async def _create_new_account(page: Page, config: Dict[str, Any]) -> bool:
 async def _handle_post_creation_signin(page: Page, config: Dict[str, Any]) -> bool:
     """Handle sign-in after account creation."""
     # After creation, Workday normally returns to a "Already have an account? Sign In" link
-    if await page.get_by_role("button", name="Sign In").is_visible():
+    sign_in_btn = _by_role(page, "button", "Sign In")
+    if await _exists(sign_in_btn):
         logging.info("🔄 Account created – returning to Sign In …")
-        await page.get_by_role("button", name="Sign In").click()
-        await page.wait_for_timeout(1000)
-        
-        # Normal sign-in after account creation
-        try:
-            logging.info("🔑 Filling login form …")
-            await page.get_by_label(EMAIL_LABEL, exact=True).fill(config["email"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_label(PASSWORD_LABEL, exact=True).fill(config["password"])
-            await page.wait_for_timeout(1000)
-            await page.get_by_role("button", name="Sign In", exact=True).click()
-            await page.wait_for_timeout(3000)
+        await sign_in_btn.click()
+        return await _submit_credentials(page, config)
 
-            # Quick sanity check
-            if await page.locator("text=Invalid").first.is_visible():
-                logging.error("❌ Login rejected – invalid credentials.")
-                await page.screenshot(path="login_invalid.png")
-                return False
-
-            logging.info("✅ Logged in.")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Sign‑in step failed: {e}")
-            await page.screenshot(path="login_failed.png")
-            return False
-    
     return True
 
 
+async def _sign_in_or_create_account(page: Page, config: Dict[str, Any]) -> bool:
+    """Race the Sign In and Create Account buttons and run whichever flow shows up."""
+    sign_in_btn = _by_role(page, "button", "Sign In")
+    create_btn = _by_role(page, "button", "Create Account")
+    try:
+        await sign_in_btn.or_(create_btn).first.wait_for(state="visible", timeout=TIMEOUTS["element_wait"])
+    except TimeoutError:
+        logging.info("ℹ️ No sign-in or create-account form shown – continuing.")
+        return True
+
+    if await sign_in_btn.first.is_visible():
+        return await _perform_existing_account_login(page, config)
+    return await _create_new_account(page, config)
+
+
 async def _navigate_to_application_form(page: Page) -> bool:
     """Navigate to the job application form by clicking Apply buttons."""
     try:
         logging.info("➡️ Clicking 'Apply' …")
-        await page.get_by_role("button", name="Apply").click(timeout=TIMEOUTS["button_click"])
+        await _by_role(page, "button", "Apply").click(timeout=TIMEOUTS["button_click"])
         await page.wait_for_timeout(1000)
 
         logging.info("📝 Clicking 'Apply Manually' …")
-        await page.get_by_role("button", name="Apply Manually").click(timeout=TIMEOUTS["button_click"])
+        await _by_role(page, "button", "Apply Manually").click(timeout=TIMEOUTS["button_click"])
         await page.wait_for_timeout(1500)
         
         return True
     except TimeoutError as e:
-        logging.error(f"⚠️ Apply buttons missing: {e}")
-        await page.screenshot(path="apply_click_error.png")
+        logging.error("⚠️ Apply buttons missing: %s", e)
+        capture_failure(page, "apply_click_error.png")
         return False
 
 
@@ -202,73 +280,28 @@ async def login_to_workday(page: Page, config: Dict[str, Any] = CONFIG) -> bool:
     Returns:
         True if the entire login and navigation process is successful, False otherwise.
     """
-    
-    # Step 1: Navigate to job page
-    if not await _navigate_and_load_page(page, config):
-        return False
-    
-    # Step 1.1: Accept cookies if banner appears
-    await _accept_cookies_if_present(page)
-
-    # Step 2: Click initial Sign In button
-    if not await _click_initial_sign_in(page):
-        return False
-
-    # Step 3: Handle existing account login
-    if not await _perform_existing_account_login(page, config):
-        return False
-
-    # Step 4: Handle account creation if needed
-    if not await _create_new_account(page, config):
-        return False
-
-    # Step 5: Navigate to application form
-    if not await _navigate_to_application_form(page):
-        return False
-
-    logging.info("🎉 Successfully navigated to the manual application page.")
-    return True
-
-
-# --- Alternative implementation using original first sample patterns (commented for reference) ---
-"""
-async def _navigate_and_sign_in_alternative(page: Page, config: Dict[str, Any]) -> bool:
-    # Alternative implementation using locator patterns from first sample
-    logging.info(f"Navigating to job URL: {config['job_url']}")
     try:
-        await page.goto(config["job_url"], wait_until="networkidle", timeout=45000)
-    except TimeoutError:
-        logging.error("Timeout while loading the job page.")
-        return False
+        # Step 1: Navigate to job page
+        if not await _navigate_and_load_page(page, config):
+            return False
 
-    try:
-        logging.info("Clicking top-level 'Sign In' button.")
-        await page.locator(SIGN_IN_BUTTON).first.click(timeout=10000)
-    except TimeoutError:
-        logging.warning("Top-level 'Sign In' button not found or timed out. Assuming already on login page.")
+        # Step 1.1: Accept cookies if banner appears
+        await _accept_cookies_if_present(page)
 
-    # Check for email field to confirm we are on login page
-    try:
-        await page.get_by_label(EMAIL_LABEL, exact=True).wait_for(timeout=5000)
-    except TimeoutError:
-        logging.error("Could not find the email field on the login page.")
-        return False
-
-    logging.info("Filling login form.")
-    await page.get_by_label(EMAIL_LABEL, exact=True).fill(config["email"])
-    await page.get_by_label(PASSWORD_LABEL, exact=True).fill(config["password"])
-    await page.locator(SIGN_IN_BUTTON).last.click()
+        # Step 2: Click initial Sign In button
+        if not await _click_initial_sign_in(page):
+            return False
 
-    try:
-        await page.wait_for_load_state("networkidle", timeout=15000)
-    except TimeoutError:
-        logging.warning("Timeout waiting for network idle after login. Continuing...")
+        # Step 3/4: Sign in to an existing account or create a new one
+        if not await _sign_in_or_create_account(page, config):
+            return False
 
-    if await page.locator(INVALID_CREDENTIALS_SELECTOR).is_visible():
-        logging.error("Login failed: Invalid credentials.")
-        await page.screenshot(path="login_failed.png")
-        return False
+        # Step 5: Navigate to application form
+        if not await _navigate_to_application_form(page):
+            return False
 
-    logging.info("Login successful.")
-    return True
-"""
+        logging.info("🎉 Successfully navigated to the manual application page.")
+        return True
+    finally:
+        # Let any failure screenshots finish before the caller closes the browser
+        await flush_screenshots()
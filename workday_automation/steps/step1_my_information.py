@@ -222,9 +222,13 @@
 #         return False
 
 
-from playwright.async_api import Page
+import json
+from playwright.async_api import Page, TimeoutError
 from utils.parser import CONFIG
-from utils.extractor import extract_all_form_fields
+from utils.extractor import PILL_SELECTOR, get_form_fields
+from utils.dom_fill import bulk_fill_text
+from utils.locators import cached_locator, open_listbox, option_locator
+from utils.screenshots import capture_failure
 
 LABEL_TO_CONFIG_KEY = {
     "How Did You Hear About Us?": "hear_about_us",
@@ -245,97 +249,170 @@ LABEL_TO_CONFIG_KEY = {
     "I have a preferred name": "preferred_name",
 }
 
+NEXT_BUTTON_SELECTOR = 'button[data-automation-id="pageFooterNextButton"]'
+
+# Labels worth looking at; everything else (including "Unknown") is skipped in one check
+ACTIVE_LABELS = frozenset(LABEL_TO_CONFIG_KEY)
+
+
+# Clicks the option of the most recently opened listbox whose text matches each of
+# `labels` and returns the labels it could not click. The listbox is looked up again
+# for every label, since a click can re-render it and detach the earlier nodes.
+SELECT_OPTIONS_JS = """
+(labels) => labels.filter((label) => {
+    const listboxes = document.querySelectorAll('[role="listbox"]');
+    const root = listboxes.length ? listboxes[listboxes.length - 1] : document;
+    const option = Array.from(root.querySelectorAll('[role="option"]'))
+        .find((el) => el.innerText.trim() === label);
+    if (!option || !option.isConnected) return true;
+    option.click();
+    return false;
+})
+"""
+
+# True once the multi-select container shows at least `count` selected chips
+# (matched by the extractor's PILL_SELECTOR, passed in as `chip`).
+SELECTED_COUNT_JS = """
+([id, count, chip]) => {
+    const container = document.getElementById(id);
+    return !!container && container.querySelectorAll(chip).length >= count;
+}
+"""
+
+
+# --- Field handlers, dispatched on type_of_input ---
+# Each takes (page, input_id, label, user_value, text_fills).
+
+async def _fill_text(page: Page, input_id: str, label: str, user_value, text_fills: list):
+    # Written in one batch after the loop
+    text_fills.append((input_id, user_value))
+
+
+async def _fill_radio(page: Page, input_id: str, label: str, user_value, text_fills: list):
+    label_attr = json.dumps(str(user_value))
+    radio = cached_locator(
+        page,
+        f'input[type="radio"][aria-label={label_attr}], [role="radio"][aria-label={label_attr}]'
+    )
+    try:
+        await radio.first.click(timeout=1000)
+    except TimeoutError:
+        await page.get_by_role("radio", name=user_value, exact=True).click(timeout=2000)
+
+
+async def _fill_checkbox(page: Page, input_id: str, label: str, user_value, text_fills: list):
+    checkbox = cached_locator(page, f'[id="{input_id}"]')
+    is_checked = await checkbox.is_checked()
+    should_check = str(user_value).lower() in ["yes", "true", "1"]
+    if should_check != is_checked:
+        await checkbox.click()
+
+
+async def _fill_dropdown(page: Page, input_id: str, label: str, user_value, text_fills: list):
+    await cached_locator(page, f'[id="{input_id}"]').click()
+    listbox = await open_listbox(page)
+
+    try:
+        await option_locator(listbox, user_value).click(timeout=1000)
+    except TimeoutError:
+        print(f"⚠️ Retrying with fallback for dropdown: {label}")
+        await listbox.locator('[role="option"]').filter(has_text=str(user_value)).first.click(timeout=2000)
+
+    await page.keyboard.press("Escape")  # Close the listbox without a click at (0, 0)
+    await cached_locator(page, '[role="listbox"]').first.wait_for(state="hidden", timeout=2000)
+
+
+async def _fill_multi_select(page: Page, input_id: str, label: str, user_value, text_fills: list):
+    if not isinstance(user_value, list):
+        print(f"⚠️ Expected list for multi-select '{label}', got: {user_value}")
+        return
+
+    try:
+        print(f"📬 Selecting multiple options for '{label}'")
+        container = cached_locator(page, f'[id="{input_id}"]')
+        input_box = container.locator("input")
+
+        await input_box.click()
+        listbox = await open_listbox(page)
+
+        # Click every wanted option in one evaluate; only misses go through locators
+        not_found = await page.evaluate(SELECT_OPTIONS_JS, user_value)
+        for val in not_found:
+            try:
+                await option_locator(listbox, val).click(timeout=2000)
+                print(f"✅ Selected fallback option: {val}")
+            except Exception as opt_err:
+                print(f"⚠️ Option '{val}' not found for '{label}': {opt_err}")
+
+        try:
+            await page.wait_for_function(
+                SELECTED_COUNT_JS, arg=[input_id, len(user_value), PILL_SELECTOR], timeout=3000
+            )
+        except TimeoutError:
+            print(f"⚠️ Not all selections for '{label}' were confirmed")
+
+        await page.keyboard.press("Escape")  # Close the listbox without a click at (0, 0)
+
+    except Exception as e:
+        print(f"⚠️ Multi-select field '{label}' failed: {e}")
+
+
+FIELD_HANDLERS = {
+    "text": _fill_text,
+    "radio": _fill_radio,
+    "checkbox": _fill_checkbox,
+    "dropdown-button": _fill_dropdown,
+    "multi-select": _fill_multi_select,
+}
+
+
 async def fill_my_information(page: Page, config: dict = CONFIG) -> bool:
     try:
         print("📄 Step 1: My Information")
-        form_fields = await extract_all_form_fields(page)
+        form_fields = await get_form_fields(page)
+        step1_values = config['step1']
+        text_fills = []  # (input_id, value) pairs written in one batch after the loop
 
         for field in form_fields:
             label = field["label"]
-            field_type = field["type_of_input"]
             input_id = field["id_of_input_component"]
-            config_key = LABEL_TO_CONFIG_KEY.get(label)
-
-            if label == "Unknown" or not input_id:
-                continue
 
-            if not config_key:
-                print(f"⚠️ No config mapping for label: '{label}'")
+            if not input_id or label not in ACTIVE_LABELS:
+                if input_id and label != "Unknown":
+                    print(f"⚠️ No config mapping for label: '{label}'")
                 continue
 
-            user_value = config['step1'].get(config_key)
+            config_key = LABEL_TO_CONFIG_KEY[label]
+            user_value = step1_values.get(config_key)
             if user_value is None:
                 print(f"⚠️ No user value for: '{label}' (key: {config_key})")
                 continue
 
-            try:
-                selector = f'[id="{input_id}"]'
-
-                # --- Text Field ---
-                if field_type == "text":
-                    field_el = page.locator(selector)
-                    await field_el.click()
-                    await page.wait_for_timeout(300)
-                    await field_el.fill(user_value)
-
-                # --- Radio Button ---
-                elif field_type == "radio":
-                    await page.get_by_role("radio", name=user_value, exact=True).click()
-
-                # --- Checkbox ---
-                elif field_type == "checkbox":
-                    checkbox = page.locator(selector)
-                    is_checked = await checkbox.is_checked()
-                    should_check = str(user_value).lower() in ["yes", "true", "1"]
-                    if should_check != is_checked:
-                        await checkbox.click()
-
-                # --- Dropdown ---
-                elif field_type == "dropdown-button":
-                    await page.locator(selector).click()
-                    await page.wait_for_timeout(300)
-
-                    try:
-                        await page.get_by_role("option", name=user_value, exact=True).click(timeout=3000)
-                    except:
-                        print(f"⚠️ Retrying with fallback for dropdown: {label}")
-                        fallback = page.locator(f'div[role="option"]:has-text("{user_value}")')
-                        await fallback.first.click(timeout=3000)
-
-                    await page.mouse.click(0, 0)
-
-                # --- Multi-select ---
-                elif field_type == "multi-select":
-                    if not isinstance(user_value, list):
-                        print(f"⚠️ Expected list for multi-select '{label}', got: {user_value}")
-                        continue
-
-                    try:
-                        print(f"📬 Selecting multiple options for '{label}'")
-                        container = page.locator(selector)
-                        input_box = container.locator("input")
-
-                        await input_box.click()
-
-                        for val in user_value:
-                            try:
-                                await page.get_by_role("option", name=val).click()
-                                await page.wait_for_timeout(500)
-                            except:
-                                await page.locator(f'div[role="option"] >> text="{val}"').first.click()
-                                print(f"✅ Selected fallback option: {val}")
-
-                        await page.mouse.click(0, 0)
-
-                    except Exception as e:
-                        print(f"⚠️ Multi-select field '{label}' failed: {e}")
+            field_type = field["type_of_input"]
+            handler = FIELD_HANDLERS.get(field_type)
+            if handler is None:
+                continue
 
+            try:
+                await handler(page, input_id, label, user_value, text_fills)
             except Exception as fill_err:
                 print(f"❌ Failed to fill field '{label}' ({field_type}): {fill_err}")
 
+        # --- Text Fields (single round-trip) ---
+        missing = await bulk_fill_text(page, text_fills)
+
+        # Fallbacks run one at a time: fill() types into whichever element has focus
+        for input_id, user_value in text_fills:
+            if input_id not in missing:
+                continue
+            try:
+                await cached_locator(page, f'[id="{input_id}"]').fill(str(user_value))
+            except Exception as fill_err:
+                print(f"❌ Failed to fill text field '{input_id}': {fill_err}")
+
         # --- Save and Continue ---
         try:
-            await page.click('button[data-automation-id="pageFooterNextButton"]')
+            await cached_locator(page, NEXT_BUTTON_SELECTOR).click()
             print("✅ Clicked 'Save and Continue'. Step 1 complete.")
             return True
         except Exception as e:
@@ -344,8 +421,5 @@ async def fill_my_information(page: Page, config: dict = CONFIG) -> bool:
 
     except Exception as e:
         print(f"❌ Step 1 failed: {e}")
-        try:
-            await page.screenshot(path="step1_failed.png")
-        except Exception as ss_err:
-            print(f"⚠️ Screenshot failed: {ss_err}")
+        capture_failure(page, "step1_failed.png")
         return False
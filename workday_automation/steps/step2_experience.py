@@ -111,197 +111,513 @@
 #             print(f"⚠️ Screenshot failed: {ss_err}")
 #         return False
 
-from playwright.async_api import Page
+import asyncio
+from types import MappingProxyType
+from typing import Dict, Tuple
+from playwright.async_api import FilePayload, Page, TimeoutError
 from utils.parser import CONFIG
-from utils.extractor import extract_all_form_fields
+from utils.extractor import extract_new_entry_fields, get_form_fields
+from utils.dom_fill import bulk_fill_text, read_field_states, state_matches
+from utils.locators import cached_locator, open_listbox, option_locator
+from utils.screenshots import capture_failure
 import logging
+import mimetypes
+import os
+import re
+import weakref
+
+# Logging is configured by the entry point (main.py); this module only emits records
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# Upload payloads keyed by path, with the mtime they were read at, so repeated
+# applications reuse the bytes read once and an edited file replaces its old entry
+_FILE_PAYLOAD_CACHE: Dict[str, Tuple[float, FilePayload]] = {}
+
+
+def file_payload(path):
+    """Return a cached in-memory upload payload for a file path (non-path values are passed through)."""
+    if not isinstance(path, str):
+        return path
+    mtime = os.path.getmtime(path)
+    cached = _FILE_PAYLOAD_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = _FILE_PAYLOAD_CACHE[path] = (mtime, {
+                "name": os.path.basename(path),
+                "mimeType": mimetypes.guess_type(path)[0] or "application/octet-stream",
+                "buffer": f.read(),
+            })
+    return cached[1]
+
+
+# Opens the dropdown with the given id and clicks the option whose text equals `value`,
+# polling once per animation frame until it renders. Resolves to whether an option was clicked.
+PICK_OPTION_JS = """
+([id, value, timeoutMs]) => new Promise(resolve => {
+    const trigger = document.getElementById(id);
+    if (!trigger) return resolve(false);
+    trigger.click();
+    const deadline = performance.now() + timeoutMs;
+    const tick = () => {
+        const listboxes = document.querySelectorAll('[role="listbox"]');
+        const root = listboxes.length ? listboxes[listboxes.length - 1] : document;
+        const option = Array.from(root.querySelectorAll('[role="option"], [data-automation-id="picklistOption"]'))
+            .find(o => o.textContent.trim() === value);
+        if (option) {
+            option.click();
+            return resolve(true);
+        }
+        if (performance.now() > deadline) return resolve(false);
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+})
+"""
+
+
+async def pick_option(page: Page, field_id: str, value: str, timeout: int = 1500) -> bool:
+    """Open a dropdown and pick an option in a single evaluate instead of several round-trips."""
+    if not await page.evaluate(PICK_OPTION_JS, [field_id, value, timeout]):
+        return False
+    try:
+        await cached_locator(page, "[role='listbox']").first.wait_for(state="hidden", timeout=2000)
+    except TimeoutError:
+        await page.keyboard.press("Escape")
+    return True
+
+
+# Types whose current state can be compared with the config value before writing
+STATEFUL_INPUT_TYPES = {"text", "textarea", "checkbox", "dropdown-button", "select"}
+
+# Snapshot of field states taken once per step, so fill_input_field can skip no-op writes
+_FIELD_STATES: "weakref.WeakKeyDictionary[Page, Dict[str, dict]]" = weakref.WeakKeyDictionary()
+
+
+async def snapshot_field_states(page: Page, form_fields: list):
+    ids = [
+        field["id_of_input_component"] for field in form_fields
+        if field["id_of_input_component"] and field["type_of_input"] in STATEFUL_INPUT_TYPES
+    ]
+    _FIELD_STATES[page] = await read_field_states(page, ids)
+
+
+def is_truthy(value) -> bool:
+    # Config booleans are normalized at load time; strings come from other sections
+    return value is True or str(value).lower() in ("yes", "true", "1")
+
+
+def already_set(page: Page, field: dict, value) -> bool:
+    """True when the snapshot shows the field already holds value, so writing it would be a no-op."""
+    state = _FIELD_STATES.get(page, {}).get(field["id_of_input_component"])
+    return state_matches(state, field["type_of_input"], value)
+
+
+def date_part_fills(field_id: str, value) -> list:
+    """(id, value) pairs for a Workday date widget from "MM/YYYY" or "MM/DD/YYYY"."""
+    date_parts = str(value).split("/")
+    if len(date_parts) < 2:
+        return []
+    fills = [
+        (f"{field_id}-dateSectionMonth-input", date_parts[0]),
+        (f"{field_id}-dateSectionYear-input", date_parts[-1]),
+    ]
+    if len(date_parts) == 3:
+        fills.append((f"{field_id}-dateSectionDay-input", date_parts[1]))
+    return fills
+
+
+# Per-type fill handlers. Each takes (page, field, value, text_batch); when text_batch
+# is given, text/textarea/date writes are queued as (id, value) pairs instead and sent
+# later in one round-trip via flush_text_batch().
+async def _fill_text(page: Page, field: dict, value, text_batch: list | None):
+    if text_batch is not None:
+        text_batch.append((field["id_of_input_component"], str(value)))
+        return
+    # fill() focuses and scrolls the element itself; no click needed first
+    await cached_locator(page, f"[id='{field['id_of_input_component']}']").fill(str(value))
+
+
+async def _fill_checkbox(page: Page, field: dict, value, text_batch: list | None):
+    locator = cached_locator(page, f"[id='{field['id_of_input_component']}']")
+    if is_truthy(value):
+        await locator.check()
+    else:
+        await locator.uncheck()
+
+
+async def _fill_dropdown(page: Page, field: dict, value, text_batch: list | None):
+    # Handle dropdown buttons (like degree, language dropdowns)
+    field_id = field["id_of_input_component"]
+    if await pick_option(page, field_id, str(value)):
+        return
+
+    # Scripted pick found nothing: close whatever opened and go through Playwright
+    await page.keyboard.press("Escape")
+    button_locator = cached_locator(page, f"button[id='{field_id}']")
+    await button_locator.click()
+    listbox = await open_listbox(page)
+    try:
+        await option_locator(listbox, value).click(timeout=1000)
+    except TimeoutError:
+        # Fall back to a substring match on the option text
+        await listbox.locator("[role='option']").filter(has_text=str(value)).first.click(timeout=2000)
+    await page.keyboard.press("Escape")  # Close the listbox without a click at (0, 0)
+    await cached_locator(page, "[role='listbox']").first.wait_for(state="hidden", timeout=2000)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+async def _fill_multi_select(page: Page, field: dict, value, text_batch: list | None):
+    # Handle multi-select fields like skills, school, field of study
+    input_locator = cached_locator(page, f"input[id='{field['id_of_input_component']}']")
+    await input_locator.click()
 
-# Helper to fill based on type using locator
-async def fill_input_field(page: Page, field: dict, value: str | bool | list):
+    for item in value if isinstance(value, list) else [value]:
+        await input_locator.fill(str(item))
+        try:
+            # Try to select from dropdown if available
+            await option_locator(cached_locator(page, "[role='listbox']").last, item).click(timeout=3000)
+        except TimeoutError:
+            # If no dropdown, press Enter to add the item
+            await page.keyboard.press("Enter")
+
+    await page.keyboard.press("Escape")  # Close the listbox without a click at (0, 0)
+
+
+async def _fill_date(page: Page, field: dict, value, text_batch: list | None):
+    field_id = field["id_of_input_component"]
+    parts = date_part_fills(field_id, value)
+    if text_batch is not None:
+        text_batch.extend(parts)
+        return
+    # Month/year(/day) sub-inputs are written together in one evaluate
+    missing = await bulk_fill_text(page, parts)
+    if missing:
+        logger.warning(
+            "⚠️ Date input failed for field '%s' with id '%s': missing %s", field.get('label', ''), field_id, missing
+        )
+
+
+async def _fill_file(page: Page, field: dict, value, text_batch: list | None):
+    field_id = field["id_of_input_component"]
+    try:
+        # One union query over the known file-input placements. set_input_files works on
+        # hidden inputs and times out quickly when none exists, so no visibility probes.
+        file_input = cached_locator(
+            page,
+            f'[data-automation-id="{field_id}"] input[type="file"], '
+            f'input[data-automation-id="file-upload-input-ref"], '
+            f'[id="{field_id}"] input[type="file"]'
+        ).first
+        try:
+            await file_input.set_input_files(file_payload(value), timeout=2000)
+        except TimeoutError:
+            # The input only appears once the select files button is clicked
+            await cached_locator(page, 'button[data-automation-id="select-files"]').click(timeout=2000)
+            await cached_locator(page, 'input[type="file"]').last.set_input_files(file_payload(value))
+    except Exception as e:
+        logger.warning("File upload failed for %s: %s", field_id, e)
+
+
+# type_of_input -> handler, built once instead of walking an if/elif ladder per field
+FIELD_HANDLERS = MappingProxyType({
+    "text": _fill_text,
+    "textarea": _fill_text,
+    "checkbox": _fill_checkbox,
+    "dropdown-button": _fill_dropdown,
+    "select": _fill_dropdown,
+    "multi-select": _fill_multi_select,
+    "date": _fill_date,
+    "single-file": _fill_file,
+    "multiple-file": _fill_file,
+})
+
+
+def field_handler(field: dict):
+    """Handler for a field; types the extractor did not classify fall back to markers in its HTML."""
+    handler = FIELD_HANDLERS.get(field["type_of_input"])
+    if handler is None:
+        html_content = field.get("html_content", "")
+        if "multiSelectContainer" in html_content:
+            handler = _fill_multi_select
+        elif "FileUpload" in html_content:
+            handler = _fill_file
+    return handler
+
+
+async def fill_input_field(page: Page, field: dict, value: str | bool | list, text_batch: list | None = None):
     field_id = field['id_of_input_component']
-    
+    logger.debug("Filling field: %s (%s) with value: %s", field['label'], field['type_of_input'], value)
+    if already_set(page, field, value):
+        logger.debug("Field %s already holds the value, skipping", field_id)
+        return
+
+    handler = field_handler(field)
+    if handler is None:
+        logger.warning("Unknown input type: %s for %s", field['type_of_input'], field['label'])
+        return
     try:
-        if field["type_of_input"] == "text":
-            locator = page.locator(f"[id='{field_id}']")
-            await locator.click()
-            await locator.fill(str(value))
-            
-        elif field["type_of_input"] == "textarea":
-            locator = page.locator(f"[id='{field_id}']")
-            await locator.click()
-            await locator.fill(str(value))
-            
-        elif field["type_of_input"] == "checkbox":
-            locator = page.locator(f"[id='{field_id}']")
-            if str(value).lower() in ["yes", "true", "1"]:
-                await locator.check()
-            else:
-                await locator.uncheck()
-                
-        elif field["type_of_input"] == "dropdown-button" or field["type_of_input"] == "select":
-            # Handle dropdown buttons (like degree, language dropdowns)
-            button_locator = page.locator(f"button[id='{field_id}']")
-            await button_locator.click()
-            await page.wait_for_timeout(500)
-            try:
-                await page.get_by_role("option", name=str(value)).click()
-            except:
-                # Try alternative selection method
-                await page.locator(f"[role='option']:has-text('{value}')").click()
-            await page.mouse.click(0, 0)  # Click away to close dropdown
-            
-        elif field["type_of_input"] == "multi-select" or "multiSelectContainer" in field.get("html_content", ""):
-            # Handle multi-select fields like skills, school, field of study
-            input_locator = page.locator(f"input[id='{field_id}']")
-            await input_locator.click()
-            
-            if isinstance(value, list):
-                for item in value:
-                    await input_locator.fill(str(item))
-                    await page.wait_for_timeout(1000)
-                    try:
-                        # Try to select from dropdown if available
-                        await page.get_by_role("option", name=str(item)).click()
-                    except:
-                        # If no dropdown, press Enter to add the item
-                        await page.keyboard.press("Enter")
-            else:
-                await input_locator.fill(str(value))
-                await page.wait_for_timeout(1000)
-                try:
-                    await page.get_by_role("option", name=str(value)).click()
-                except:
-                    await page.keyboard.press("Enter")
-            
-            await page.mouse.click(0, 0)  # Click away
-            
-        elif field["type_of_input"] == "date":
-            # Extract month/year/day from the value (e.g., "06/2023" or "06/15/2023")
-            date_parts = str(value).split("/")
-            month = date_parts[0] if len(date_parts) >= 2 else None
-            year = date_parts[1] if len(date_parts) >= 2 else None
-            day = date_parts[1] if len(date_parts) == 3 else None
-
-            try:
-                # Fill Month
-                if month:
-                    await page.fill(f"input[id='{field_id}-dateSectionMonth-input']", month)
-
-                # Fill Year
-                if year:
-                    await page.fill(f"input[id='{field_id}-dateSectionYear-input']", year)
-
-                # Optional: Fill Day if present
-                if len(date_parts) == 3 and day:
-                    await page.fill(f"input[id='{field_id}-dateSectionDay-input']", day)
+        await handler(page, field, value, text_batch)
+    except Exception as e:
+        logger.warning("Failed to fill field '%s' (ID: %s): %s", field['label'], field_id, e)
 
-            except Exception as e:
-                logging.warning(
-                    f"⚠️ Date input failed for field '{field.get('label', '')}' with id '{field_id}': {e}"
-                )
 
-        elif field["type_of_input"] == "multiple-file" or "FileUpload" in field.get("html_content", ""):
-            # Handle file uploads
+async def flush_text_batch(page: Page, text_batch: list):
+    """Write queued text/date values in one evaluate call, falling back to fill() for ids not found."""
+    missing = await bulk_fill_text(page, text_batch)
+    for field_id, value in text_batch:
+        if field_id in missing:
             try:
-                # Try different file input selectors
-                file_selectors = [
-                    f'[data-automation-id="{field_id}"] input[type="file"]',
-                    f'input[data-automation-id="file-upload-input-ref"]',
-                    f'[id="{field_id}"] input[type="file"]'
-                ]
-                
-                for selector in file_selectors:
-                    file_input = page.locator(selector)
-                    if await file_input.is_visible():
-                        await file_input.set_input_files(value)
-                        break
-                else:
-                    # Try clicking the select files button first
-                    select_button = page.locator(f'button[data-automation-id="select-files"]')
-                    if await select_button.is_visible():
-                        await select_button.click()
-                        await page.wait_for_timeout(500)
-                        file_input = page.locator('input[type="file"]').last
-                        await file_input.set_input_files(value)
+                await cached_locator(page, f"[id='{field_id}']").fill(value)
             except Exception as e:
-                logging.warning(f"File upload failed for {field_id}: {e}")
-                
-        else:
-            logging.warning(f"Unknown input type: {field['type_of_input']} for {field['label']}")
-            
+                logger.warning("Failed to fill field '%s': %s", field_id, e)
+    text_batch.clear()
+
+
+# Compiled once; the key group is what WORK_EXPERIENCE_VALUES/EDUCATION_VALUES dispatch on
+ENTRY_FIELD_ID = re.compile(r"(workExperience|education|certification|language|webAddress)-(\d+)--?(\w+)")
+
+
+def index_entry_fields(form_fields: list) -> dict:
+    """
+    Groups repeatable section fields by entry so each config entry can look up its own fields.
+
+    Workday ids look like "workExperience-3--jobTitle". The numeric part is not
+    guaranteed to start at 1, so entries are numbered 1..n in order of appearance.
+
+    Returns:
+        {(prefix, entry_number): {key: field}}, e.g. {("workExperience", 1): {"jobTitle": {...}}}
+    """
+    index = {}
+    entry_numbers = {}
+    for field in form_fields:
+        match = ENTRY_FIELD_ID.match(field.get("id_of_input_component") or "")
+        if not match:
+            continue
+        prefix, raw_number, key = match.groups()
+        numbers = entry_numbers.setdefault(prefix, {})
+        entry = numbers.setdefault(raw_number, len(numbers) + 1)
+        index.setdefault((prefix, entry), {})[key] = field
+    return index
+
+
+NEXT_BUTTON_SELECTOR = 'button[data-automation-id="pageFooterNextButton"]'
+NEXT_BUTTON_NAME = re.compile(r"^(Next|Continue|Save and Continue)$")
+UPLOAD_DONE_SELECTOR = (
+    '[data-automation-id="file-upload-successful"], '
+    '[data-automation-id="file-upload-success"], '
+    '[data-automation-id="file-upload-complete"]'
+)
+LANGUAGE_SKILL_RE = re.compile(r"comprehension|overall|reading|speaking|writing", re.IGNORECASE)
+
+# Config value for each id key of a repeatable entry (e.g. "jobTitle" in
+# "workExperience-1--jobTitle"). A getter returning None leaves the field alone.
+WORK_EXPERIENCE_VALUES = MappingProxyType({
+    "jobTitle": lambda we: we["job_title"],
+    "companyName": lambda we: we["company"],
+    "location": lambda we: we["location"],
+    # Past jobs uncheck the box too, in case the panel came pre-checked (e.g. from resume
+    # parsing); a box already in the wanted state is skipped by the field-state snapshot
+    "currentlyWorkHere": lambda we: bool(we["currently_work_here"]),
+    "startDate": lambda we: f"{we['start_month']}/{we['start_year']}",
+    "endDate": lambda we: None if we["currently_work_here"] else f"{we['end_month']}/{we['end_year']}",
+    "roleDescription": lambda we: we["description"],
+})
+
+EDUCATION_VALUES = MappingProxyType({
+    "school": lambda edu: edu["school_option"],
+    "schoolName": lambda edu: edu["school_option"],
+    "degree": lambda edu: edu.get("degree", ""),
+    "fieldOfStudy": lambda edu: edu.get("field_of_study", ""),
+    "gradeAverage": lambda edu: edu.get("grade", ""),
+    "firstYearAttended": lambda edu: edu["start_year"],
+    "lastYearAttended": lambda edu: edu["end_year"],
+})
+
+
+# Input types that open a shared listbox overlay and therefore must be filled one at a time
+SERIAL_INPUT_TYPES = {"dropdown-button", "select", "radio", "multi-select"}
+
+
+async def fill_entry(page: Page, fields: dict, value_getters: dict, entry: dict, text_batch: list):
+    """
+    Fill one work experience/education entry from its {key: field} index.
+
+    Independent inputs (text, textarea, checkbox, date, file) are filled concurrently;
+    overlay-based inputs run afterwards, one at a time.
+    """
+    independent, serial = [], []
+    for key, field in fields.items():
+        getter = value_getters.get(key)
+        if getter is None:
+            continue
+        value = getter(entry)
+        if value is None:
+            continue
+        is_serial = field["type_of_input"] in SERIAL_INPUT_TYPES or "multiSelectContainer" in field.get("html_content", "")
+        (serial if is_serial else independent).append((field, value))
+
+    await asyncio.gather(
+        *(fill_input_field(page, field, value, text_batch) for field, value in independent),
+        return_exceptions=True,
+    )
+    for field, value in serial:
+        await fill_input_field(page, field, value, text_batch)
+
+
+# (id prefix, DOM section name, config key) of the sections that repeat per config entry
+REPEATABLE_SECTIONS = (
+    ("workExperience", "Work-Experience", "work_experience"),
+    ("education", "Education", "education"),
+)
+# Containers of the repeatable sections only; attachments, languages, websites etc. are never touched
+REPEATABLE_SECTION_SELECTOR = ", ".join(
+    f'div[role="group"][aria-labelledby="{section}-section"]' for _, section, _ in REPEATABLE_SECTIONS
+)
+
+
+async def delete_existing_entries(page: Page):
+    """
+    Remove the work experience/education entries already on the page (e.g. from resume parsing).
+
+    Entries are deleted one at a time: the panels re-render after each delete, so the
+    remaining buttons are re-queried instead of clicking a stale snapshot.
+    """
+    delete_buttons = page.locator(REPEATABLE_SECTION_SELECTOR).get_by_role("button", name="Delete", exact=True)
+    deleted = 0
+    while remaining := await delete_buttons.count():
+        await delete_buttons.first.click()
+        try:
+            # The count dropping by one means the last button index no longer resolves
+            await delete_buttons.nth(remaining - 1).wait_for(state="detached", timeout=3000)
+        except TimeoutError:
+            logger.warning("⚠️ Entry did not disappear after Delete; keeping the remaining %s", remaining)
+            break
+        deleted += 1
+    if deleted:
+        logger.info("🗑️ Deleted %s existing entries.", deleted)
+
+
+async def add_section_entries(page: Page, section: str, existing: int, wanted: int) -> list:
+    """Add panels existing+1..wanted to one section; returns the fields of the new panels."""
+    added = []
+    for entry_number in range(existing + 1, wanted + 1):
+        try:
+            added.extend(await extract_new_entry_fields(page, section, entry_number))
+        except Exception as e:
+            logger.warning("Could not add %s entry %s: %s", section, entry_number, e)
+            break
+    return added
+
+
+async def add_missing_entries(page: Page, entry_fields: dict, step2_config: dict) -> list:
+    """
+    Add a panel for every config entry the page does not have yet; returns only the new fields.
+
+    Sections are handled one after another: Add clicks move focus and re-render the form,
+    which would disturb another section's panel extraction running at the same time.
+    """
+    added = []
+    for prefix, section, config_key in REPEATABLE_SECTIONS:
+        added.extend(await add_section_entries(
+            page,
+            section,
+            sum(1 for entry_prefix, _ in entry_fields if entry_prefix == prefix),
+            len(step2_config.get(config_key, [])),
+        ))
+    return added
+
+
+async def fill_work_experience(page: Page, entry_fields: dict, work_experiences: list, text_batch: list):
+    for i, we in enumerate(work_experiences):
+        logger.info("📝 Filling work experience %s", i + 1)
+        await fill_entry(page, entry_fields.get(("workExperience", i + 1), {}), WORK_EXPERIENCE_VALUES, we, text_batch)
+
+
+async def fill_education(page: Page, entry_fields: dict, education_entries: list, text_batch: list):
+    for i, edu in enumerate(education_entries):
+        logger.info("🎓 Filling education %s", i + 1)
+        await fill_entry(page, entry_fields.get(("education", i + 1), {}), EDUCATION_VALUES, edu, text_batch)
+
+
+def bucket_fields(form_fields: list) -> dict:
+    """
+    Sorts the non-entry fields the step needs into buckets in one pass over the extracted fields.
+
+    Returns:
+        {"file": [...], "skills": [...], "linkedin": [...]}
+    """
+    buckets = {"file": [], "skills": [], "linkedin": []}
+    for field in form_fields:
+        field_id = field.get("id_of_input_component", "")
+        if ENTRY_FIELD_ID.match(field_id):
+            # Entry fields (e.g. certification attachments) are filled per entry, never as the resume
+            continue
+        if (
+            field["type_of_input"] in ("single-file", "multiple-file")
+            or "attachments" in field_id
+            or "FileUpload" in field.get("html_content", "")
+        ):
+            buckets["file"].append(field)
+        elif field["section_name"] == "Skills" or "skills" in field_id:
+            buckets["skills"].append(field)
+        elif "linkedin" in field["label"].lower() or "linkedin" in field_id:
+            buckets["linkedin"].append(field)
+    return buckets
+
+
+async def upload_resume(page: Page, resume_field: dict | None, resume_path: str | None):
+    if not resume_path or resume_field is None:
+        return
+    logger.info("📄 Uploading resume...")
+    try:
+        await fill_input_field(page, resume_field, resume_path)
+        # Wait for Workday to confirm the upload instead of a fixed delay
+        await cached_locator(page, UPLOAD_DONE_SELECTOR).first.wait_for(state="visible", timeout=10000)
+        logger.info("📌 Resume uploaded.")
     except Exception as e:
-        logging.warning(f"Failed to fill field '{field['label']}' (ID: {field_id}): {e}")
+        logger.error("❌ Resume upload failed: %s", e)
 
 
 async def fill_my_experience(page: Page, config: dict = CONFIG) -> bool:
     try:
-        print("\n💼 Step 2: My Experience")
-        
-        # Extract all form fields only once
-        form_fields = await extract_all_form_fields(page)
-
-        # --- WORK EXPERIENCE ---
-        work_experiences = config["step2"].get("work_experience", [])
-        for i, we in enumerate(work_experiences):
-            print(f"📝 Filling work experience {i + 1}")
-            for field in form_fields:
-                field_id = field.get("id_of_input_component", "")
-                if field["section_name"] == "Work Experience" and f"workExperience-" in field_id:
-                    if "jobTitle" in field_id:
-                        await fill_input_field(page, field, we["job_title"])
-                    elif "companyName" in field_id:
-                        await fill_input_field(page, field, we["company"])
-                    elif "location" in field_id:
-                        await fill_input_field(page, field, we["location"])
-                    elif "currentlyWorkHere" in field_id:
-                        await fill_input_field(page, field, we.get("currently_work_here", False))
-                    elif "startDate" in field_id:
-                        await fill_input_field(page, field, f"{we['start_month']}/{we['start_year']}")
-                    elif "endDate" in field_id:
-                        if not we.get("currently_work_here", False):
-                            await fill_input_field(page, field, f"{we['end_month']}/{we['end_year']}")
-                    elif "roleDescription" in field_id:
-                        await fill_input_field(page, field, we["description"])
-        await page.wait_for_timeout(2000)
-
-        # --- EDUCATION ---
-        education_entries = config["step2"].get("education", [])
-
-        for i, edu in enumerate(education_entries):
-            print(f"🎓 Filling education {i + 1}")
-            await page.wait_for_timeout(2000)
-            
-            for field in form_fields:
-                field_id = field.get("id_of_input_component")
-                section = field.get("section_name", "")
-                
-                if not field_id or section != "Education" or not field_id.startswith("education-"):
-                    continue
+        logger.info("💼 Step 2: My Experience")
+        step2_config = config["step2"]
+
+        # Opt-in: start from empty sections so the entries on the page are exactly the config entries
+        if step2_config.get("clear_existing_entries", False):
+            await delete_existing_entries(page)
 
-                if "school" in field_id:
-                    school_value = edu.get("school_option", edu.get("school", ""))
-                    await fill_input_field(page, field, school_value)
+        # Extract all form fields only once
+        form_fields = await get_form_fields(page)
 
-                elif "degree" in field_id:
-                    await fill_input_field(page, field, edu.get("degree", ""))
+        # Index repeatable-section fields by entry once instead of rescanning per entry
+        entry_fields = index_entry_fields(form_fields)
 
-                elif "fieldOfStudy" in field_id:
-                    await fill_input_field(page, field, edu.get("field_of_study", ""))
+        # Add panels for config entries beyond those on the page; only the new panels are extracted
+        added_fields = await add_missing_entries(page, entry_fields, step2_config)
+        if added_fields:
+            form_fields = form_fields + added_fields
+            entry_fields = index_entry_fields(form_fields)
 
-                elif "gradeAverage" in field_id:
-                    await fill_input_field(page, field, edu.get("grade", ""))
+        # Resume, skills and LinkedIn fields, found in a single pass
+        buckets = bucket_fields(form_fields)
 
-                elif "firstYearAttended" in field_id:
-                    await fill_input_field(page, field, edu.get("start_year", "2020"))
+        # Read every field's current state once; fields that already match are not rewritten
+        await snapshot_field_states(page, form_fields)
 
-                elif "lastYearAttended" in field_id:
-                    await fill_input_field(page, field, edu.get("end_year", "2024"))
+        # Text/textarea/date values from every section are queued here and written
+        # in a single evaluate just before clicking Next
+        text_batch = []
 
-        await page.wait_for_timeout(1000)
+        # Work experience (text/date/checkbox) and the resume upload open no overlays, so they
+        # run together. Education opens listboxes, which a click elsewhere on the page would
+        # dismiss, so it runs on its own afterwards.
+        await asyncio.gather(
+            fill_work_experience(page, entry_fields, step2_config.get("work_experience", []), text_batch),
+            upload_resume(page, buckets["file"][0] if buckets["file"] else None, step2_config.get("resume_path")),
+        )
+        await fill_education(page, entry_fields, step2_config.get("education", []), text_batch)
 
 
         # --- CERTIFICATIONS ---
@@ -351,77 +667,56 @@ async def fill_my_experience(page: Page, config: dict = CONFIG) -> bool:
 
 
         # --- LANGUAGES ---
-        langs = config["step2"].get("languages", [])
+        langs = step2_config.get("languages", [])
         for i, lang in enumerate(langs):
-            print(f"🌐 Filling language {i + 1}")
-            for field in form_fields:
-                field_id = field.get("id_of_input_component", "")
-                if field["section_name"] == "Languages" and f"language-" in field_id:
-                    if field_id.endswith("--language"):
-                        await fill_input_field(page, field, lang["language"])
-                    elif "native" in field_id:
-                        await fill_input_field(page, field, lang.get("native", False))
-                    elif any(skill in field["label"].lower() for skill in ["comprehension", "overall", "reading", "speaking", "writing"]):
-                        await fill_input_field(page, field, lang["proficiency"])
-        await page.wait_for_timeout(2000)
+            logger.info("🌐 Filling language %s", i + 1)
+            for key, field in entry_fields.get(("language", i + 1), {}).items():
+                if key == "language":
+                    await fill_input_field(page, field, lang["language"])
+                elif "native" in key:
+                    await fill_input_field(page, field, lang["native"])
+                elif skill := LANGUAGE_SKILL_RE.search(field["label"]):
+                    await fill_input_field(page, field, lang[skill.group(0).lower()])
 
         # --- SKILLS ---
-        print("🔧 Filling skills...")
-        skills = config["step2"].get("skills", [])
-        for field in form_fields:
-            field_id = field.get("id_of_input_component", "")
-            if field["section_name"] == "Skills" or "skills" in field_id:
-                await fill_input_field(page, field, skills)
-        await page.wait_for_timeout(2000)
-
-        # --- RESUME UPLOAD ---
-        print("📄 Uploading resume...")
-        resume_uploaded = False
-        for field in form_fields:
-            field_id = field.get("id_of_input_component", "")
-            if ("attachments" in field_id or "FileUpload" in field.get("html_content", "")) and not resume_uploaded:
-                resume_path = config["step2"].get("resume_path")
-                if resume_path:
-                    try:
-                        await fill_input_field(page, field, resume_path)
-                        print("📌 Resume uploaded.")
-                        resume_uploaded = True
-                        await page.wait_for_timeout(3000)
-                    except Exception as e:
-                        print(f"❌ Resume upload failed: {e}")
-        await page.wait_for_timeout(2000)
+        logger.info("🔧 Filling skills...")
+        skills = step2_config.get("skills", [])
+        for field in buckets["skills"]:
+            await fill_input_field(page, field, skills)
 
         # --- WEBSITES ---
-        print("🌐 Filling websites...")
-        websites = config["step2"].get("websites", [])
+        logger.info("🌐 Filling websites...")
+        websites = step2_config.get("websites", [])
         for i, website in enumerate(websites):
-            for field in form_fields:
-                field_id = field.get("id_of_input_component", "")
-                if field["section_name"] == "Websites" and f"webAddress-" in field_id:
-                    if "url" in field_id:
-                        await fill_input_field(page, field, website["url"])
-        await page.wait_for_timeout(2000)
+            for key, field in entry_fields.get(("webAddress", i + 1), {}).items():
+                if "url" in key:
+                    await fill_input_field(page, field, website["url"], text_batch)
 
         # --- LINKEDIN ---
-        print("💼 Filling LinkedIn...")
-        linkedin_url = config["step2"].get("linkedin", "")
+        logger.info("💼 Filling LinkedIn...")
+        linkedin_url = step2_config.get("linkedin", "")
         if linkedin_url:
-            for field in form_fields:
-                if "linkedin" in field["label"].lower() or "linkedin" in field.get("id_of_input_component", ""):
-                    await fill_input_field(page, field, linkedin_url)
-        await page.wait_for_timeout(2000)
+            for field in buckets["linkedin"]:
+                await fill_input_field(page, field, linkedin_url, text_batch)
+        await flush_text_batch(page, text_batch)
+        _FIELD_STATES.pop(page, None)
 
         # --- CLICK NEXT ---
-        print("➡️ Clicking Next button...")
-        next_button = page.locator('button[data-automation-id="pageFooterNextButton"]')
-        await next_button.click()
-        print("✅ Step 2 completed.")
-
+        logger.info("➡️ Clicking Next button...")
+        # One union locator: the footer button, or any Next/Continue button if the tenant renamed it
+        next_button = cached_locator(page, NEXT_BUTTON_SELECTOR).or_(
+            page.get_by_role("button", name=NEXT_BUTTON_NAME)
+        ).first
+        await next_button.click(timeout=5000)
+        # Next was already clicked; a page that keeps polling must not fail the step
+        try:
+            await page.wait_for_load_state("networkidle", timeout=5000)
+        except TimeoutError:
+            pass
+        logger.info("✅ Step 2 completed.")
+        return True
 
     except Exception as err:
-        print(f"❌ Step 2 failed: {err}")
-        try:
-            await page.screenshot(path="step2_failed.png")
-        except Exception as ss_err:
-            print(f"⚠️ Screenshot failed: {ss_err}")
+        logger.error("❌ Step 2 failed: %s", err)
+        capture_failure(page, "step2_failed.png")
         return False
@@ -1,10 +1,17 @@
-from playwright.async_api import Page
+import asyncio
+import json
+import re
+from types import MappingProxyType
+from typing import Callable
+from playwright.async_api import Page, TimeoutError
 from utils.parser import CONFIG
-from utils.extractor import extract_all_form_fields
+from utils.extractor import get_form_fields
+from utils.dom_fill import bulk_fill_text, read_field_states, state_matches
+from utils.locators import cached_locator
+from utils.screenshots import capture_failure
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Timeout constants
 TIMEOUTS = {
@@ -12,9 +19,31 @@ TIMEOUTS = {
     "medium": 3000,     # 3 seconds  
     "long": 5000,       # 5 seconds
     "dropdown": 2000,   # 2 seconds for dropdown
-    "animation": 500    # 0.5 seconds for animations
+    "animation": 500,   # 0.5 seconds for animations
+    "field": 4000       # 4 seconds overall budget for filling one question
 }
 
+# Input types that open the shared listbox overlay and therefore must be filled one at a time
+SERIAL_INPUT_TYPES = {"dropdown-button"}
+# Plain inputs whose value/checked state is written directly in one batched evaluate
+BATCHED_INPUT_TYPES = {"text", "textarea", "checkbox"}
+
+NEXT_BUTTON_SELECTOR = ", ".join([
+    'button[data-automation-id="pageFooterNextButton"]:visible',
+    'button[data-automation-id="continueButton"]:visible',
+    'button:has-text("Next"):visible',
+    'button:has-text("Continue"):visible',
+    'button[type="submit"]:visible',
+])
+# Every known option markup for a given (JSON-quoted) text, as one union selector
+OPTION_SELECTOR_TEMPLATE = ", ".join([
+    '[role="option"]:has-text({text})',
+    '[data-automation-id="picklistOption"]:has-text({text})',
+    '[role="listbox"] li:has-text({text})',
+])
+FORM_FIELD_SELECTOR = '[data-automation-id^="formField-"]'
+LISTBOX_OPTION_SELECTOR = '[role="listbox"] [role="option"], [data-automation-id="picklistOption"]'
+
 async def fill_input_field(page: Page, field: dict, value: str | bool):
     """Fill a single form field based on its type."""
     field_id = field['id_of_input_component']
@@ -22,229 +51,359 @@ async def fill_input_field(page: Page, field: dict, value: str | bool):
     field_type = field.get('type_of_input', 'unknown')
     
     if not field_id:
-        logging.warning(f"⚠️ Skipping field '{field_label}' - no ID found")
+        logger.warning("⚠️ Skipping field '%s' - no ID found", field_label)
         return False
     
+    # Bound once; every branch below works on the string form of the answer
+    text = str(value)
+    
     try:
         if field_type == "dropdown-button":
             # Handle dropdown buttons (Yes/No questions)
-            button_locator = page.locator(f"button[id='{field_id}']")
-            
-            # Wait for button to be visible
-            await button_locator.wait_for(state="visible", timeout=TIMEOUTS["medium"])
+            button_locator = cached_locator(page, f"button[id='{field_id}']")
             
-            # Click to open dropdown
-            await button_locator.click()
-            await page.wait_for_timeout(TIMEOUTS["dropdown"])
+            # Click to open dropdown (click waits for the button to be visible itself)
+            await button_locator.click(timeout=TIMEOUTS["medium"])
             
             try:
-                # Wait for options to appear
-                await page.wait_for_selector('[role="listbox"] [role="option"], [data-automation-id="picklistOption"]', 
-                                           timeout=TIMEOUTS["dropdown"])
+                # Wait for the options to render instead of sleeping after the click
+                await cached_locator(page, LISTBOX_OPTION_SELECTOR).first.wait_for(
+                    state="visible", timeout=TIMEOUTS["dropdown"]
+                )
                 
-                # Select the option
-                option_clicked = False
-                option_selectors = [
-                    f'[role="option"]:has-text("{str(value)}")',
-                    f'[data-automation-id="picklistOption"]:has-text("{str(value)}")',
-                    f'[role="option"]:text-is("{str(value)}")',
-                    f'li:has-text("{str(value)}")'
-                ]
-                
-                for selector in option_selectors:
-                    try:
-                        option = page.locator(selector)
-                        if await option.count() > 0:
-                            await option.click()
-                            option_clicked = True
-                            logging.info(f"   ✅ Selected '{value}' for '{field_label}'")
-                            break
-                    except:
-                        continue
-                
-                if not option_clicked:
-                    # Try using get_by_role as fallback
-                    await page.get_by_role("option", name=str(value)).click()
-                    logging.info(f"   ✅ Selected '{value}' for '{field_label}' (fallback method)")
+                # Select the option: one union selector over the known option markups,
+                # resolved in a single query instead of probing each with count()
+                option = cached_locator(page, OPTION_SELECTOR_TEMPLATE.format(text=json.dumps(text))).first
+                await option.click(timeout=TIMEOUTS["dropdown"])
+                logger.info("   ✅ Selected '%s' for '%s'", value, field_label)
                 
             except Exception as option_error:
-                logging.warning(f"   ⚠️ Could not select option '{value}' for '{field_label}': {option_error}")
+                logger.warning("   ⚠️ Could not select option '%s' for '%s': %s", value, field_label, option_error)
                 # Close dropdown by pressing Escape
                 await page.keyboard.press("Escape")
                 return False
             
-            # Close dropdown by clicking away
-            await page.mouse.click(0, 0)
-            await page.wait_for_timeout(TIMEOUTS["animation"])
-            
-        elif field_type == "text":
-            # Handle text inputs
-            locator = page.locator(f"[id='{field_id}']")
-            await locator.wait_for(state="visible", timeout=TIMEOUTS["medium"])
-            await locator.click()
-            await locator.fill(str(value))
-            await page.wait_for_timeout(TIMEOUTS["short"])
+            await page.keyboard.press("Escape")  # Close the listbox without a click at (0, 0)
+            try:
+                # Continue as soon as the listbox is gone rather than after a fixed animation delay
+                await cached_locator(page, '[role="listbox"]').first.wait_for(state="hidden", timeout=TIMEOUTS["dropdown"])
+            except TimeoutError:
+                logger.warning("   ⚠️ Listbox for '%s' did not close", field_label)
             
-        elif field_type == "textarea":
-            # Handle textarea inputs
-            locator = page.locator(f"[id='{field_id}']")
-            await locator.wait_for(state="visible", timeout=TIMEOUTS["medium"])
-            await locator.click()
-            await locator.fill(str(value))
-            await page.wait_for_timeout(TIMEOUTS["short"])
+        elif field_type in ("text", "textarea"):
+            # fill() waits for the input and focuses it itself, so no separate wait/click
+            locator = cached_locator(page, f"[id='{field_id}']")
+            await locator.fill(text, timeout=TIMEOUTS["medium"])
             
         elif field_type == "checkbox":
-            # Handle checkboxes
-            locator = page.locator(f"[id='{field_id}']")
-            await locator.wait_for(state="visible", timeout=TIMEOUTS["medium"])
+            # Handle checkboxes; check()/uncheck() wait for the element and verify the new state
+            locator = cached_locator(page, f"[id='{field_id}']")
             
-            if str(value).lower() in ["yes", "true", "1"]:
-                await locator.check()
+            if text.lower() in ["yes", "true", "1"]:
+                await locator.check(timeout=TIMEOUTS["medium"])
             else:
-                await locator.uncheck()
-            await page.wait_for_timeout(TIMEOUTS["short"])
+                await locator.uncheck(timeout=TIMEOUTS["medium"])
             
         elif field_type == "radio":
-            # Handle radio buttons
-            radio_locator = page.locator(f"input[type='radio'][value='{value}']")
-            if await radio_locator.count() == 0:
-                # Try finding by associated label
-                radio_locator = page.locator(f"input[type='radio']").filter(has_text=str(value))
+            # Handle radio buttons: match by value, or else by associated label, in one
+            # union locator scoped to this question's fieldset (the extractor's id sits inside it)
+            group = cached_locator(page, f"fieldset:has([id='{field_id}'])")
+            radio_locator = group.locator(f"input[type='radio'][value='{text}']").or_(
+                group.get_by_label(text, exact=True).and_(group.locator("input[type='radio']"))
+            )
             
-            await radio_locator.wait_for(state="visible", timeout=TIMEOUTS["medium"])
-            await radio_locator.click()
-            await page.wait_for_timeout(TIMEOUTS["short"])
+            await radio_locator.click(timeout=TIMEOUTS["medium"])
             
         else:
-            logging.warning(f"⚠️ Unknown field type '{field_type}' for field '{field_label}'")
+            logger.warning("⚠️ Unknown field type '%s' for field '%s'", field_type, field_label)
             return False
         
         return True
         
     except Exception as e:
-        logging.error(f"❌ Failed to fill field '{field_label}' (ID: {field_id}, Type: {field_type}): {e}")
+        logger.error("❌ Failed to fill field '%s' (ID: %s, Type: %s): %s", field_label, field_id, field_type, e)
         return False
 
-def find_config_value_for_question(question_text: str, config: dict) -> str:
+async def wait_for_form(page: Page):
+    """Wait until the first form field is attached; proceeds anyway if the page has none."""
+    try:
+        await cached_locator(page, FORM_FIELD_SELECTOR).first.wait_for(
+            state="attached", timeout=TIMEOUTS["medium"]
+        )
+    except Exception:
+        logger.warning("⚠️ No form fields appeared; continuing")
+
+# Question phrasings for each step3 config key, built once at import
+QUESTION_PATTERNS = MappingProxyType({
+    # Work authorization patterns
+    "authorization": [
+        "legally authorized to work", 
+        "authorized to work", 
+        "work authorization", 
+        "legal authorization",
+        "work legally",
+        "employment authorization"
+    ],
+    
+    # Sponsorship patterns
+    "sponsorship": [
+        "sponsorship", 
+        "visa sponsorship", 
+        "require sponsorship", 
+        "need sponsorship",
+        "extend your current work authorization",
+        "continue and/or extend your current work authorization"
+    ],
+    
+    # Age patterns
+    "age": [
+        "18 years of age", 
+        "over 18", 
+        "at least 18", 
+        "18 or older",
+        "age of majority"
+    ],
+    
+    # Background check patterns
+    "background_check": [
+        "background check", 
+        "background investigation", 
+        "criminal background",
+        "background screening"
+    ],
+    
+    # Drug test patterns
+    "drug_test": [
+        "drug test", 
+        "drug screening", 
+        "substance test",
+        "pre-employment drug"
+    ],
+    
+    # Relocation patterns
+    "relocation": [
+        "relocate", 
+        "relocation", 
+        "willing to relocate",
+        "able to relocate"
+    ],
+    
+    # Travel patterns
+    "travel": [
+        "travel", 
+        "willing to travel", 
+        "business travel",
+        "travel required"
+    ],
+    
+    # Notice period patterns
+    "notice_period": [
+        "notice period", 
+        "how much notice", 
+        "notice required",
+        "start date"
+    ],
+    
+    # Salary patterns
+    "salary": [
+        "salary", 
+        "compensation", 
+        "expected salary",
+        "salary expectation"
+    ]
+})
+
+def keyword_regex(phrases_by_key) -> re.Pattern:
     """
-    Match a question to a config value using keywords and patterns.
-    This function dynamically maps questions to config values.
+    One optional lookahead per key, each a named group over that key's phrases.
+
+    The lookaheads are zero-width, so at every position of the text each key is tried
+    independently and overlapping phrases of different keys are all found. With a plain
+    alternation, a phrase could consume the text of another key's phrase and hide it.
+    """
+    return re.compile(
+        "".join(
+            f"(?=(?P<{key}>{'|'.join(re.escape(phrase) for phrase in phrases)}))?"
+            for key, phrases in phrases_by_key
+        ),
+        re.IGNORECASE,
+    )
+
+def matched_keys(regex: re.Pattern, text: str) -> set:
+    """Keys of a keyword_regex with at least one phrase occurring anywhere in text."""
+    return {key for match in regex.finditer(text) for key, found in match.groupdict().items() if found is not None}
+
+# All phrasings in one pattern with a named group per config key, so a single
+# scan of the question finds every category it mentions
+QUESTION_RE = keyword_regex(QUESTION_PATTERNS.items())
+
+# Defaults when no config key matches, tried in order
+FALLBACK_ANSWERS = (
+    (re.compile("authorized|legal|work"), "Yes"),   # Default to Yes for work authorization
+    (re.compile("sponsorship|visa"), "No"),         # Default to No for sponsorship
+    (re.compile("18|age"), "Yes"),                  # Default to Yes for age questions
+    (re.compile("background|drug|test"), "Yes"),    # Default to Yes for background/drug test consent
+)
+
+# Simple mode: one key phrase per step3 config key, with the answer used when the key is unset
+SIMPLE_QUESTION_DEFAULTS = MappingProxyType({
+    "authorization": ("Are you legally authorized to work", "Yes"),
+    "sponsorship": ("Will you require sponsorship", "No"),
+    "age": ("Are you 18 years of age", "Yes"),
+    "background_check": ("background check", "Yes"),
+    "drug_test": ("drug test", "Yes"),
+    "relocation": ("willing to relocate", "No"),
+    "travel": ("willing to travel", "Yes"),
+})
+SIMPLE_QUESTION_RE = keyword_regex(
+    (config_key, [phrase]) for config_key, (phrase, _) in SIMPLE_QUESTION_DEFAULTS.items()
+)
+
+def build_question_resolver(config: dict) -> Callable[[str], str]:
+    """
+    Specialize question matching to one config.
+
+    The step3 answers are fixed for the whole run, so the configured pattern
+    categories (in priority order) and the single-word keys are looked up once
+    here; the returned resolver only scans the question.
     """
-    question_lower = question_text.lower()
-    
-    # Get step3 config
     step3_config = config.get("step3", {})
     
-    # Define question patterns and their corresponding config keys
-    question_patterns = {
-        # Work authorization patterns
-        "authorization": [
-            "legally authorized to work", 
-            "authorized to work", 
-            "work authorization", 
-            "legal authorization",
-            "work legally",
-            "employment authorization"
-        ],
-        
-        # Sponsorship patterns
-        "sponsorship": [
-            "sponsorship", 
-            "visa sponsorship", 
-            "require sponsorship", 
-            "need sponsorship",
-            "extend your current work authorization",
-            "continue and/or extend your current work authorization"
-        ],
-        
-        # Age patterns
-        "age": [
-            "18 years of age", 
-            "over 18", 
-            "at least 18", 
-            "18 or older",
-            "age of majority"
-        ],
+    # Pattern categories that have an answer, in QUESTION_PATTERNS priority order
+    pattern_answers = [
+        (config_key, str(step3_config[config_key]))
+        for config_key in QUESTION_PATTERNS
+        if step3_config.get(config_key) is not None
+    ]
+    # Config keys that can match a question word directly (only words longer than 3 characters are tried)
+    word_answers = {
+        str(key): str(value) for key, value in step3_config.items()
+        if value is not None and len(str(key)) > 3
+    }
+    
+    def resolve(question_text: str) -> str:
+        question_lower = question_text.lower()
         
-        # Background check patterns
-        "background_check": [
-            "background check", 
-            "background investigation", 
-            "criminal background",
-            "background screening"
-        ],
+        # Try to match question to a pattern
+        question_keys = matched_keys(QUESTION_RE, question_lower)
+        for config_key, config_value in pattern_answers:
+            if config_key in question_keys:
+                logger.info("🎯 Matched question '%s...' to config key '%s' with value '%s'", question_text[:50], config_key, config_value)
+                return config_value
         
-        # Drug test patterns
-        "drug_test": [
-            "drug test", 
-            "drug screening", 
-            "substance test",
-            "pre-employment drug"
-        ],
+        # If no pattern matches, try direct key matching with question keywords
+        for word in question_lower.split():
+            config_value = word_answers.get(word)
+            if config_value is not None:
+                logger.info("🎯 Found direct match for word '%s' with value '%s'", word, config_value)
+                return config_value
         
-        # Relocation patterns
-        "relocation": [
-            "relocate", 
-            "relocation", 
-            "willing to relocate",
-            "able to relocate"
-        ],
+        # Default fallback values based on question content
+        for keywords, answer in FALLBACK_ANSWERS:
+            if keywords.search(question_lower):
+                return answer
         
-        # Travel patterns
-        "travel": [
-            "travel", 
-            "willing to travel", 
-            "business travel",
-            "travel required"
-        ],
+        logger.warning("⚠️ No matching config found for question: '%s'. Using default 'Yes'", question_text)
+        return "Yes"  # Safe default
+    
+    return resolve
+
+def find_config_value_for_question(question_text: str, config: dict) -> str:
+    """
+    Match a question to a config value using keywords and patterns.
+    For many questions, build the resolver once with build_question_resolver instead.
+    """
+    return build_question_resolver(config)(question_text)
+
+def select_application_questions(form_fields: list) -> list:
+    """Fields of the Application Questions section that have a usable label and id."""
+    application_questions = []
+    for field in form_fields:
+        # Check if this field belongs to Application Questions section
+        section_name = field.get("section_name", "")
+        if (section_name == "Application Questions" or 
+            section_name == "main" or 
+            "questionnaire" in field.get("id_of_input_component", "").lower()):
+            
+            # Skip fields without proper labels or IDs
+            if (field.get("label") and 
+                field.get("label") != "Unknown" and 
+                field.get("id_of_input_component")):
+                application_questions.append(field)
+    return application_questions
+
+async def click_next(page: Page) -> bool:
+    """Click the first visible Next/Continue button and wait for the next page to settle."""
+    print("➡️ Clicking Next button...")
+    try:
+        # All known Next/Continue button markups in one selector; the first visible match wins
+        next_button = cached_locator(page, NEXT_BUTTON_SELECTOR).first
+        try:
+            await next_button.click(timeout=TIMEOUTS["medium"])
+        except TimeoutError:
+            logger.warning("⚠️ Could not find Next/Continue button")
+            return False
         
-        # Notice period patterns
-        "notice_period": [
-            "notice period", 
-            "how much notice", 
-            "notice required",
-            "start date"
-        ],
+        # Next was already clicked; a page that keeps polling must not fail the step
+        try:
+            await page.wait_for_load_state("networkidle", timeout=TIMEOUTS["long"])
+        except TimeoutError:
+            pass
+        return True
         
-        # Salary patterns
-        "salary": [
-            "salary", 
-            "compensation", 
-            "expected salary",
-            "salary expectation"
-        ]
-    }
-    
-    # Try to match question to a pattern
-    for config_key, patterns in question_patterns.items():
-        for pattern in patterns:
-            if pattern in question_lower:
-                config_value = step3_config.get(config_key)
-                if config_value is not None:
-                    logging.info(f"🎯 Matched question '{question_text[:50]}...' to config key '{config_key}' with value '{config_value}'")
-                    return str(config_value)
-    
-    # If no pattern matches, try direct key matching with question keywords
-    question_words = question_lower.split()
-    for word in question_words:
-        if len(word) > 3:  # Only consider words longer than 3 characters
-            config_value = step3_config.get(word)
-            if config_value is not None:
-                logging.info(f"🎯 Found direct match for word '{word}' with value '{config_value}'")
-                return str(config_value)
-    
-    # Default fallback values based on question content
-    if any(keyword in question_lower for keyword in ["authorized", "legal", "work"]):
-        return "Yes"  # Default to Yes for work authorization
-    elif any(keyword in question_lower for keyword in ["sponsorship", "visa"]):
-        return "No"   # Default to No for sponsorship
-    elif any(keyword in question_lower for keyword in ["18", "age"]):
-        return "Yes"  # Default to Yes for age questions
-    elif any(keyword in question_lower for keyword in ["background", "drug", "test"]):
-        return "Yes"  # Default to Yes for background/drug test consent
-    
-    logging.warning(f"⚠️ No matching config found for question: '{question_text}'. Using default 'Yes'")
-    return "Yes"  # Safe default
+    except Exception as e:
+        logger.error("❌ Failed to click Next button: %s", e)
+        return False
+
+def report_fill(field: dict, success: bool) -> bool:
+    # If it's a required field and we failed, this could be problematic
+    if not success and field.get("required", False):
+        logger.error("❌ Failed to fill required field: %s", field.get("label", ""))
+    return success
+
+async def fill_within_budget(page: Page, field: dict, value: str | bool) -> bool:
+    """fill_input_field bounded by the per-question budget; a timeout counts as a failed fill."""
+    try:
+        return await asyncio.wait_for(fill_input_field(page, field, value), TIMEOUTS["field"] / 1000)
+    except asyncio.TimeoutError:
+        logger.warning("⚠️ Filling '%s' exceeded its %sms budget", field.get("label", "Unknown"), TIMEOUTS["field"])
+        return False
+
+async def fill_question(page: Page, field: dict, value: str) -> bool:
+    return report_fill(field, await fill_within_budget(page, field, value))
+
+def batch_value(field: dict, value: str) -> str | bool:
+    """Value as bulk_fill_text expects it: checked state for checkboxes, text otherwise."""
+    if field.get("type_of_input") == "checkbox":
+        return str(value).lower() in ["yes", "true", "1"]
+    return value
+
+async def fill_batched_questions(page: Page, questions: list, answers: dict) -> dict:
+    """
+    Write all text/textarea/checkbox answers in a single evaluate; any input the
+    script could not find goes through the regular locator fill.
+
+    Returns:
+        {field id: filled?}
+    """
+    missing = set(await bulk_fill_text(page, [
+        (field["id_of_input_component"], batch_value(field, answers[field["id_of_input_component"]]))
+        for field in questions
+    ]))
+    outcome = {}
+    for field in questions:
+        field_id = field["id_of_input_component"]
+        success = field_id not in missing or await fill_input_field(page, field, answers[field_id])
+        outcome[field_id] = report_fill(field, success)
+    return outcome
+
+def summarize_answers(questions: list, answers: dict, outcome: dict) -> str:
+    """One line per question: fill result, question text and the answer used."""
+    return "\n".join(
+        f"   {'✅' if outcome.get(field['id_of_input_component']) else '❌'} "
+        f"{field.get('label', '')[:60]} ({field.get('type_of_input', '')}) = '{answers[field['id_of_input_component']]}'"
+        for field in questions
+    )
 
 async def fill_application_questions(page: Page, config: dict = CONFIG) -> bool:
     """
@@ -253,111 +412,78 @@ async def fill_application_questions(page: Page, config: dict = CONFIG) -> bool:
     try:
         print("\n❓ Step 3: Application Questions")
         
-        # Wait for page to stabilize
-        await page.wait_for_timeout(TIMEOUTS["medium"])
+        # Wait for the form to render instead of a fixed delay
+        await wait_for_form(page)
         
-        # Extract all form fields from the current page
-        all_form_data = await extract_all_form_fields(page)
-        
-        # Filter for Application Questions section
-        application_questions = []
-        for field in all_form_data:
-            # Check if this field belongs to Application Questions section
-            section_name = field.get("section_name", "")
-            if (section_name == "Application Questions" or 
-                section_name == "main" or 
-                "questionnaire" in field.get("id_of_input_component", "").lower()):
-                
-                # Skip fields without proper labels or IDs
-                if (field.get("label") and 
-                    field.get("label") != "Unknown" and 
-                    field.get("id_of_input_component")):
-                    application_questions.append(field)
+        # Form fields are memoized per page by get_form_fields, so a retry on the
+        # same rendered page does not walk the DOM again
+        application_questions = select_application_questions(await get_form_fields(page))
         
         if not application_questions:
-            logging.warning("⚠️ No application questions found on this page")
-            return True
+            # Nothing to answer: advance right away instead of leaving the wizard on this page
+            logger.warning("⚠️ No application questions found on this page; clicking Next")
+            return await click_next(page)
         
-        logging.info(f"📋 Found {len(application_questions)} application questions to fill")
+        logger.info("📋 Found %s application questions to fill", len(application_questions))
         
-        # Fill each question
-        filled_count = 0
-        for i, field in enumerate(application_questions, 1):
-            question_text = field.get("label", "")
-            field_id = field.get("id_of_input_component", "")
-            field_type = field.get("type_of_input", "")
-            is_required = field.get("required", False)
-            
-            print(f"\n📝 Question {i}: {question_text}")
-            print(f"   Type: {field_type} | Required: {is_required} | ID: {field_id}")
-            
-            # Find the appropriate config value for this question
-            config_value = find_config_value_for_question(question_text, config)
-            
-            print(f"   📌 Using value: '{config_value}'")
-            
-            # Fill the field
-            success = await fill_input_field(page, field, config_value)
-            if success:
-                filled_count += 1
-                print(f"   ✅ Successfully filled")
-            else:
-                print(f"   ❌ Failed to fill")
-                
-                # If it's a required field and we failed, this could be problematic
-                if is_required:
-                    logging.error(f"❌ Failed to fill required field: {question_text}")
-            
-            # Small delay between fields
-            await page.wait_for_timeout(TIMEOUTS["short"])
+        # Resolve every answer up front with a resolver specialized to this config
+        resolve = build_question_resolver(config)
+        answers = {
+            field["id_of_input_component"]: resolve(field.get("label", ""))
+            for field in application_questions
+        }
         
-        print(f"\n📊 Summary: Successfully filled {filled_count}/{len(application_questions)} questions")
+        # Questions already answered (e.g. when a later step bounced back here) are not touched;
+        # their current states are read in one round-trip
+        states = await read_field_states(page, list(answers))
+        outcome = {
+            field["id_of_input_component"]: True for field in application_questions
+            if state_matches(states.get(field["id_of_input_component"]), field.get("type_of_input", ""),
+                             answers[field["id_of_input_component"]])
+        }
+        pending = [f for f in application_questions if f["id_of_input_component"] not in outcome]
         
-        # Wait before proceeding
-        await page.wait_for_timeout(TIMEOUTS["medium"])
+        # Text/textarea/checkbox answers are written in one batched round-trip, radios
+        # run concurrently, and dropdowns share the page's overlay so go one at a time
+        batched = [f for f in pending if f.get("type_of_input") in BATCHED_INPUT_TYPES]
+        serial = [f for f in pending if f.get("type_of_input") in SERIAL_INPUT_TYPES]
+        independent = [
+            f for f in pending
+            if f.get("type_of_input") not in SERIAL_INPUT_TYPES | BATCHED_INPUT_TYPES
+        ]
         
-        # Click Next/Continue button
-        print("➡️ Clicking Next button...")
-        try:
-            # Try different button selectors
-            next_button_selectors = [
-                'button[data-automation-id="pageFooterNextButton"]',
-                'button[data-automation-id="continueButton"]',
-                'button:has-text("Next")',
-                'button:has-text("Continue")',
-                'button[type="submit"]'
-            ]
-            
-            clicked = False
-            for selector in next_button_selectors:
-                try:
-                    button = page.locator(selector)
-                    if await button.count() > 0 and await button.is_visible():
-                        await button.click()
-                        clicked = True
-                        logging.info(f"✅ Clicked next button using selector: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not clicked:
-                logging.warning("⚠️ Could not find Next/Continue button")
-                return False
-            
-            await page.wait_for_timeout(TIMEOUTS["medium"])
-            print("✅ Step 3 completed successfully.")
-            return True
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to click Next button: {e}")
+        if batched:
+            outcome.update(await fill_batched_questions(page, batched, answers))
+        # Each question carries its own time budget, so one stuck field fails alone
+        # instead of every field being padded with fixed sleeps
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                field["id_of_input_component"]: tg.create_task(
+                    fill_question(page, field, answers[field["id_of_input_component"]])
+                )
+                for field in independent
+            }
+        outcome.update((field_id, task.result()) for field_id, task in tasks.items())
+        for field in serial:
+            outcome[field["id_of_input_component"]] = await fill_question(
+                page, field, answers[field["id_of_input_component"]]
+            )
+        filled_count = sum(outcome.values())
+        
+        # One aggregated record instead of several prints per question
+        logger.info(
+            "📊 Filled %s/%s questions\n%s",
+            filled_count, len(application_questions), summarize_answers(application_questions, answers, outcome),
+        )
+        
+        if not await click_next(page):
             return False
+        print("✅ Step 3 completed successfully.")
+        return True
     
     except Exception as err:
-        logging.error(f"❌ Step 3 failed: {err}")
-        try:
-            await page.screenshot(path="step3_failed.png")
-        except Exception as ss_err:
-            logging.error(f"⚠️ Screenshot failed: {ss_err}")
+        logger.error("❌ Step 3 failed: %s", err)
+        capture_failure(page, "step3_failed.png")
         return False
 
 # Alternative simplified version if you prefer direct mapping
@@ -368,27 +494,22 @@ async def fill_application_questions_simple(page: Page, config: dict = CONFIG) -
     try:
         print("\n❓ Step 3: Application Questions (Simple Mode)")
         
-        # Wait for page to stabilize
-        await page.wait_for_timeout(TIMEOUTS["medium"])
+        # Wait for the form to render instead of a fixed delay
+        await wait_for_form(page)
         
         # Extract form fields
-        all_form_data = await extract_all_form_fields(page)
+        all_form_data = await get_form_fields(page)
         
         # Get step3 config
         step3_config = config.get("step3", {})
         
-        # Direct question mapping
+        # Direct question mapping: config key -> answer
         question_mappings = {
-            "Are you legally authorized to work": step3_config.get("authorization", "Yes"),
-            "Will you require sponsorship": step3_config.get("sponsorship", "No"),
-            "Are you 18 years of age": step3_config.get("age", "Yes"),
-            "background check": step3_config.get("background_check", "Yes"),
-            "drug test": step3_config.get("drug_test", "Yes"),
-            "willing to relocate": step3_config.get("relocation", "No"),
-            "willing to travel": step3_config.get("travel", "Yes")
+            config_key: step3_config.get(config_key, default)
+            for config_key, (_, default) in SIMPLE_QUESTION_DEFAULTS.items()
         }
         
-        filled_count = 0
+        answers = []
         for field in all_form_data:
             if (field.get("section_name") in ["Application Questions", "main"] and 
                 field.get("label") and 
@@ -397,28 +518,40 @@ async def fill_application_questions_simple(page: Page, config: dict = CONFIG) -
                 
                 question = field.get("label", "")
                 
-                # Find matching config value
-                config_value = None
-                for key_phrase, value in question_mappings.items():
-                    if key_phrase.lower() in question.lower():
-                        config_value = value
-                        break
+                # Find matching config value; one scan of the question, first key in table order wins
+                question_keys = matched_keys(SIMPLE_QUESTION_RE, question)
+                config_value = next(
+                    (value for config_key, value in question_mappings.items() if config_key in question_keys), None
+                )
                 
                 if config_value:
                     print(f"📝 Filling: {question[:60]}... = {config_value}")
-                    success = await fill_input_field(page, field, config_value)
-                    if success:
-                        filled_count += 1
+                    answers.append((field, config_value))
+        
+        # Non-dropdown answers run concurrently; dropdowns share the overlay and go one at a time
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(fill_within_budget(page, field, value)) for field, value in answers
+                if field.get("type_of_input") not in SERIAL_INPUT_TYPES
+            ]
+        results = [task.result() for task in tasks]
+        for field, value in answers:
+            if field.get("type_of_input") in SERIAL_INPUT_TYPES:
+                results.append(await fill_within_budget(page, field, value))
+        filled_count = sum(results)
         
         print(f"✅ Filled {filled_count} questions")
         
         # Click Next
-        next_button = page.locator('button[data-automation-id="pageFooterNextButton"]')
+        next_button = cached_locator(page, 'button[data-automation-id="pageFooterNextButton"]')
         await next_button.click()
-        await page.wait_for_timeout(TIMEOUTS["medium"])
+        try:
+            await page.wait_for_load_state("networkidle", timeout=TIMEOUTS["long"])
+        except TimeoutError:
+            pass
         
         return True
         
     except Exception as err:
-        logging.error(f"❌ Step 3 (Simple) failed: {err}")
+        logger.error("❌ Step 3 (Simple) failed: %s", err)
         return False
@@ -1,93 +1,171 @@
-from playwright.async_api import Page
+import asyncio
+import logging
+from types import MappingProxyType
+from typing import List, Tuple
+
+from playwright.async_api import Locator, Page, TimeoutError
 from utils.parser import CONFIG
+from utils.screenshots import capture_failure
+
+logger = logging.getLogger(__name__)
+
+LISTBOX_SELECTOR = '[role="listbox"]'
+# Next/Save and Continue buttons identified by automation id; text-labelled ones are matched by role
+NEXT_BUTTON_SELECTOR = ", ".join([
+    'button[data-automation-id="pageFooterNextButton"]:visible',
+    'button[data-automation-id="continueButton"]:visible',
+])
+NEXT_BUTTON_NAMES = ("Save and Continue", "Continue", "Next")
+# Last resort when no known Next button matched: the page footer's last button
+FOOTER_BUTTON_SELECTOR = '[data-automation-id="pageFooter"] button'
+# Every way a field id is exposed on an element, as one union selector; format with fid=
+FIELD_SELECTOR_TEMPLATE = '[id="{fid}"], [name="{fid}"], [data-automation-id="{fid}"]'
+# Extracted ids may lack the personal-info prefix the dropdown's element id carries
+PREFIXED_DROPDOWN_SELECTOR_TEMPLATE = FIELD_SELECTOR_TEMPLATE + ', [id="personalInfoPerson--{fid}"]'
+# Common checkbox patterns, used only when nothing carries the field's own id
+GENERIC_CHECKBOX_SELECTOR = 'input[name="acceptTermsAndAgreements"], input[data-automation-id="createAccountCheckbox"]'
+
+# Keyword found in a dropdown's id or label → step4 config key; first match wins
+FIELD_CONFIG_KEYS = MappingProxyType({
+    "nationality": "nationality",
+    "gender": "gender",
+    "ethnicity": "ethnicity",
+    "veteran": "veteran_status",
+})
+
+
+def _partition_fields(voluntary_fields: list, step4_config: dict) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+    """
+    Split the extracted Voluntary Disclosures fields by what will be done with them.
+
+    Returns:
+        (dropdowns, checkboxes, others): (label, id, config value) for dropdowns to select,
+        (label, id, should_check) for consent checkboxes, and (label, reason) for skipped fields.
+    """
+    # Config values per keyword and the consent flag do not change across fields
+    config_values = {keyword: step4_config.get(key) for keyword, key in FIELD_CONFIG_KEYS.items()}
+    consent = step4_config.get("consent", False)
+
+    dropdowns, checkboxes, others = [], [], []
+    for field in voluntary_fields:
+        field_label = field.get("label", "")
+        field_id = field.get("id_of_input_component")
+        field_type = field.get("type_of_input", "")
+
+        if not field_id:
+            others.append((field_label, "no ID found"))
+            continue
+
+        if field_type == "dropdown-button":
+            # Map config values to form fields
+            haystack = f"{field_id} {field_label}".lower()
+            config_value = next(
+                (value for keyword, value in config_values.items() if keyword in haystack), None
+            )
+            options = field.get("options") or []
+            field_options = frozenset(options)
+
+            # No extracted options means they load lazily on click, so try the dropdown anyway
+            if config_value and (not field_options or config_value in field_options):
+                dropdowns.append((field_label, field_id, config_value))
+            elif config_value:
+                others.append((field_label, f"config value '{config_value}' not in options: {options[:5]}..."))
+            else:
+                others.append((field_label, "no matching config value"))
 
+        elif field_type == "checkbox":
+            # Handle consent/terms checkboxes
+            label_lower = field_label.lower()
+            if "terms" in label_lower or "consent" in label_lower or "agree" in label_lower:
+                checkboxes.append((field_label, field_id, consent))
+            else:
+                others.append((field_label, "not a consent checkbox"))
 
-async def _choose_from_dropdown(page: Page, field_id: str, option_text: str) -> bool:
+        else:
+            others.append((field_label, f"unsupported type '{field_type}'"))
+
+    return dropdowns, checkboxes, others
+
+
+def _dropdown_locator(page: Page, field_id: str) -> Locator:
+    """All selector strategies for a dropdown, resolved as one union locator."""
+    template = FIELD_SELECTOR_TEMPLATE if "personalInfoPerson--" in field_id else PREFIXED_DROPDOWN_SELECTOR_TEMPLATE
+    return page.locator(template.format(fid=field_id)).first
+
+
+def _next_button_locator(page: Page) -> Locator:
+    """Every known Next/Save and Continue button composed with or_() into one query."""
+    button = page.locator(NEXT_BUTTON_SELECTOR)
+    for name in NEXT_BUTTON_NAMES:
+        button = button.or_(page.get_by_role("button", name=name))
+    return button.first
+
+
+async def _checkbox_locator(page: Page, field_id: str) -> Locator:
+    """The checkbox carrying the field's id, or else a common consent checkbox."""
+    # Resolved in priority order: one union with .first would pick by document order instead
+    own = page.locator(FIELD_SELECTOR_TEMPLATE.format(fid=field_id)).first
+    try:
+        await own.wait_for(state="attached", timeout=1000)
+        return own
+    except TimeoutError:
+        return page.locator(GENERIC_CHECKBOX_SELECTOR).first
+
+
+async def _choose_from_dropdown(page: Page, dropdown: Locator, option_text: str) -> bool:
     """Open a dropdown and pick an option (exact match)."""
     try:
-        # Wait for the dropdown to be available
-        await page.wait_for_timeout(500)
-        
-        # Try different selector strategies for the dropdown
-        dropdown_selectors = [
-            f'[id="{field_id}"]',
-            f'[name="{field_id}"]',
-            f'[data-automation-id="{field_id}"]',
-            # For the specific IDs in your extracted data
-            f'[id="personalInfoPerson--{field_id.replace("personalInfoPerson--", "")}"]' if "personalInfoPerson--" not in field_id else f'[id="{field_id}"]'
-        ]
-        
-        dropdown = None
-        for selector in dropdown_selectors:
-            try:
-                dropdown = page.locator(selector)
-                if await dropdown.count() > 0:
-                    break
-            except:
-                continue
-        
-        if dropdown is None or await dropdown.count() == 0:
-            print(f"   ⚠️  Could not find dropdown with ID: {field_id}")
+        # Open the dropdown once it is rendered; the picklist overlay is modal, so
+        # wait until it is gone again before returning and letting the next one open.
+        try:
+            await dropdown.wait_for(state="visible", timeout=3000)
+        except TimeoutError:
+            logger.warning("⚠️ Could not find dropdown: %s", dropdown)
             return False
-            
-        # Click to open dropdown
         await dropdown.click()
-        await page.wait_for_timeout(500)
-        
-        # Select the option
-        await page.get_by_role("option", name=option_text, exact=True).click()
-        await page.wait_for_timeout(500)
+        # Look the option up inside the listbox that just opened, not across the whole page
+        listbox = page.locator(f"{LISTBOX_SELECTOR}:visible").last
+        await listbox.wait_for(state="visible", timeout=2000)
+        await listbox.get_by_role("option", name=option_text, exact=True).click()
+        await page.wait_for_selector(LISTBOX_SELECTOR, state="hidden", timeout=2000)
         
         return True
         
     except Exception as e:
-        print(f"   ⚠️  Error selecting dropdown option: {e}")
+        logger.warning("⚠️ Error selecting dropdown option '%s': %s", option_text, e)
         return False
 
 
+async def _ensure_checked(checkbox: Locator) -> None:
+    # check() waits for the box itself and does nothing when it is already checked
+    await checkbox.check(timeout=3000)
+
+
+async def _ensure_unchecked(checkbox: Locator) -> None:
+    await checkbox.uncheck(timeout=3000)
+
+
 async def _handle_checkbox(page: Page, field_id: str, should_check: bool) -> bool:
     """Handle checkbox fields."""
     try:
-        # Try different selector strategies for checkboxes
-        checkbox_selectors = [
-            f'[id="{field_id}"]',
-            f'[name="{field_id}"]',
-            f'[data-automation-id="{field_id}"]',
-            # Common checkbox patterns
-            'input[name="acceptTermsAndAgreements"]',
-            'input[data-automation-id="createAccountCheckbox"]'
-        ]
-        
-        checkbox = None
-        for selector in checkbox_selectors:
-            try:
-                checkbox = page.locator(selector)
-                if await checkbox.count() > 0:
-                    break
-            except:
-                continue
-        
-        if checkbox is None or await checkbox.count() == 0:
-            print(f"   ⚠️  Could not find checkbox with ID: {field_id}")
+        checkbox = await _checkbox_locator(page, field_id)
+        try:
+            # Consent boxes are almost always checked, so that path needs no state read
+            await (_ensure_checked(checkbox) if should_check else _ensure_unchecked(checkbox))
+        except TimeoutError:
+            logger.warning("⚠️ Could not find checkbox: %s", checkbox)
             return False
-        
-        # Check or uncheck based on requirement
-        if should_check:
-            if not await checkbox.is_checked():
-                await checkbox.check()
-                print(f"   ✔  Checkbox checked: {field_id}")
-        else:
-            if await checkbox.is_checked():
-                await checkbox.uncheck()
-                print(f"   ✔  Checkbox unchecked: {field_id}")
-        
         return True
         
     except Exception as e:
-        print(f"   ⚠️  Error handling checkbox: {e}")
+        logger.warning("⚠️ Error handling checkbox: %s", e)
         return False
 
 
+def _summary_line(success: bool, label: str, value) -> str:
+    return f"   {'✅' if success else '❌'} {label} → {value}"
+
+
 async def fill_voluntary_disclosures(page: Page, config: dict = CONFIG, extracted_form_data: dict = None) -> bool:
     """
     Dynamic Step 4: Voluntary Disclosures.
@@ -99,149 +177,68 @@ async def fill_voluntary_disclosures(page: Page, config: dict = CONFIG, extracte
         # Get step4 config data
         step4_config = config.get("step4", {})
         if not step4_config:
-            print("⚠️  No step4 config found; attempting to continue...")
+            logger.warning("⚠️ No step4 config found; attempting to continue...")
             await page.click('button[data-automation-id="pageFooterNextButton"]')
             return True
 
+        # One line per field, logged as a single record once the fields are done
+        summary = []
+
         # If we have extracted form data, use it to guide filling
         if extracted_form_data and "Voluntary Disclosures" in extracted_form_data:
-            voluntary_fields = extracted_form_data["Voluntary Disclosures"]
+            # Decide what to fill first; the browser work happens afterwards
+            dropdowns, checkboxes, others = _partition_fields(extracted_form_data["Voluntary Disclosures"], step4_config)
+            summary.extend(f"   ⚠️ Skipped {field_label}: {reason}" for field_label, reason in others)
             
-            for field in voluntary_fields:
-                field_label = field.get("label", "")
-                field_id = field.get("id_of_input_component")
-                field_type = field.get("type_of_input", "")
-                field_options = field.get("options", [])
-                is_required = field.get("required", False)
-                
-                if not field_id:
-                    print(f"   ⚠️  Skipping field '{field_label}' - no ID found")
-                    continue
-                
-                print(f"🔄  Processing field: {field_label} (ID: {field_id}, Type: {field_type})")
-                
-                # Handle different field types
-                if field_type == "dropdown-button":
-                    # Map config values to form fields
-                    config_value = None
-                    
-                    # Primary Nationality
-                    if "nationality" in field_id.lower() or "nationality" in field_label.lower():
-                        config_value = step4_config.get("nationality")
-                    
-                    # Gender
-                    elif "gender" in field_id.lower() or "gender" in field_label.lower():
-                        config_value = step4_config.get("gender")
-                    
-                    # Ethnicity (if present)
-                    elif "ethnicity" in field_id.lower() or "ethnicity" in field_label.lower():
-                        config_value = step4_config.get("ethnicity")
-                    
-                    # Veteran Status (if present)
-                    elif "veteran" in field_id.lower() or "veteran" in field_label.lower():
-                        config_value = step4_config.get("veteran_status")
-                    
-                    if config_value and config_value in field_options:
-                        print(f"   🎯  Selecting '{config_value}' for {field_label}")
-                        success = await _choose_from_dropdown(page, field_id, config_value)
-                        if success:
-                            print(f"   ✔  {field_label} → {config_value}")
-                        else:
-                            print(f"   ❌  Failed to select {field_label}")
-                    else:
-                        print(f"   ⚠️  No matching config value for {field_label}")
-                        if config_value:
-                            print(f"        Config value '{config_value}' not in options: {field_options[:5]}...")
-                
-                elif field_type == "checkbox":
-                    # Handle consent/terms checkboxes
-                    if "terms" in field_label.lower() or "consent" in field_label.lower() or "agree" in field_label.lower():
-                        should_check = step4_config.get("consent", False)
-                        print(f"   ☑️  Processing consent checkbox: {should_check}")
-                        success = await _handle_checkbox(page, field_id, should_check)
-                        if success:
-                            print(f"   ✔  Consent checkbox processed")
-                        else:
-                            print(f"   ❌  Failed to process consent checkbox")
-                
-                # Add small delay between fields
-                await page.wait_for_timeout(300)
+            # Dropdowns share the modal picklist overlay, so they are selected one at a time
+            for field_label, field_id, config_value in dropdowns:
+                success = await _choose_from_dropdown(page, _dropdown_locator(page, field_id), config_value)
+                summary.append(_summary_line(success, field_label, config_value))
+            
+            # Checkboxes are independent of each other and run once no overlay is open
+            checkbox_results = await asyncio.gather(
+                *(_handle_checkbox(page, field_id, should_check)
+                  for _, field_id, should_check in checkboxes)
+            )
+            summary.extend(
+                _summary_line(success, field_label, should_check)
+                for (field_label, _, should_check), success in zip(checkboxes, checkbox_results)
+            )
         
         else:
             # Fallback to original hardcoded approach if no extracted data
-            print("📋  Using fallback hardcoded approach...")
-            
-            # Nationality
-            if step4_config.get("nationality"):
-                try:
-                    print("🌍  Selecting nationality...")
-                    nationality_dropdown = page.locator('[id="personalInfoPerson--nationality"]')
-                    await _choose_from_dropdown(page, "personalInfoPerson--nationality", step4_config["nationality"])
-                    print(f"   ✔  Nationality → {step4_config['nationality']}")
-                except Exception as e:
-                    print(f"   ⚠️  Nationality selection failed: {e}")
+            summary.append("   📋 Using fallback hardcoded approach")
             
-            # Gender
-            if step4_config.get("gender"):
-                try:
-                    print("🚻  Selecting gender...")
-                    await _choose_from_dropdown(page, "personalInfoPerson--gender", step4_config["gender"])
-                    print(f"   ✔  Gender → {step4_config['gender']}")
-                except Exception as e:
-                    print(f"   ⚠️  Gender selection failed: {e}")
+            # Nationality and gender
+            for label, field_id, key in (
+                ("Nationality", "personalInfoPerson--nationality", "nationality"),
+                ("Gender", "personalInfoPerson--gender", "gender"),
+            ):
+                if step4_config.get(key):
+                    success = await _choose_from_dropdown(page, _dropdown_locator(page, field_id), step4_config[key])
+                    summary.append(_summary_line(success, label, step4_config[key]))
             
             # Consent checkbox
             if step4_config.get("consent"):
-                try:
-                    print("☑️  Processing consent...")
-                    await _handle_checkbox(page, "termsAndConditions--acceptTermsAndAgreements", True)
-                    print("   ✔  Consent processed")
-                except Exception as e:
-                    print(f"   ⚠️  Consent processing failed: {e}")
-
-        # Wait a moment before proceeding
-        await page.wait_for_timeout(1000)
-        
-        # Click Next/Save and Continue button
+                success = await _handle_checkbox(page, "termsAndConditions--acceptTermsAndAgreements", True)
+                summary.append(_summary_line(success, "Consent", True))
+
+        logger.info("📊 Step 4 fields\n%s", "\n".join(summary) or "   (none)")
+
+        # Click Next/Save and Continue button; if even the footer fallback fails the step fails
         try:
-            next_button_selectors = [
-                'button[data-automation-id="pageFooterNextButton"]',
-                'button[data-automation-id="continueButton"]',
-                'button:has-text("Save and Continue")',
-                'button:has-text("Continue")',
-                'button:has-text("Next")'
-            ]
-            
-            button_clicked = False
-            for selector in next_button_selectors:
-                try:
-                    button = page.locator(selector)
-                    if await button.count() > 0:
-                        await button.click()
-                        button_clicked = True
-                        print("   ✔  Clicked continue button")
-                        break
-                except:
-                    continue
-            
-            if not button_clicked:
-                print("   ⚠️  Could not find continue button, trying generic approach...")
-                await page.keyboard.press("Tab")
-                await page.keyboard.press("Enter")
-            
-        except Exception as e:
-            print(f"   ⚠️  Error clicking continue button: {e}")
+            await _next_button_locator(page).click(timeout=5000)
+        except TimeoutError:
+            logger.warning("⚠️ Could not find continue button, trying the page footer...")
+            await page.locator(FOOTER_BUTTON_SELECTOR).last.click(timeout=3000)
+        await page.wait_for_load_state("domcontentloaded")
         
         print("✅  Step 4 completed successfully")
         return True
 
     except Exception as top_err:
-        print(f"❌  Step 4 FAILED: {top_err}")
-        try:
-            await page.screenshot(path="step4_failed.png")
-            print("📸  Screenshot saved: step4_failed.png")
-        except Exception:
-            pass
+        logger.error("❌ Step 4 FAILED: %s", top_err)
+        capture_failure(page, "step4_failed.png", debug_only=True)
         return False
 
 
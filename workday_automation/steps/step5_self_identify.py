@@ -1,5 +1,11 @@
+import logging
+
 from playwright.async_api import Page
+from utils.dom_fill import bulk_fill_text
 from utils.parser import CONFIG
+from utils.screenshots import capture_failure
+
+logger = logging.getLogger(__name__)
 
 async def fill_self_identify(page: Page, config: dict = CONFIG) -> bool:
     """
@@ -13,7 +19,6 @@ async def fill_self_identify(page: Page, config: dict = CONFIG) -> bool:
         # ---------- Name ----------
         if "name" in data:
             await page.locator('[name="name"]').fill(data["name"])
-            print(f"👤 Name filled: {data['name']}")
         else:
             raise ValueError("Missing 'name' in step5 config")
 
@@ -24,29 +29,35 @@ async def fill_self_identify(page: Page, config: dict = CONFIG) -> bool:
         date_vals = data["date"]
         DATE_ID = "selfIdentifiedDisabilityData--dateSignedOn"
 
-        await page.fill(f"#{DATE_ID}-dateSectionMonth-input", date_vals["month"])
-        await page.fill(f"#{DATE_ID}-dateSectionDay-input", date_vals["day"])
-        await page.fill(f"#{DATE_ID}-dateSectionYear-input", date_vals["year"])
-        print(f"📅 Date selected: {date_vals['month']}/{date_vals['day']}/{date_vals['year']}")
+        # Month/day/year sub-inputs are written together in one evaluate
+        date_parts = [
+            (f"{DATE_ID}-dateSectionMonth-input", date_vals["month"]),
+            (f"{DATE_ID}-dateSectionDay-input", date_vals["day"]),
+            (f"{DATE_ID}-dateSectionYear-input", date_vals["year"]),
+        ]
+        for part_id in await bulk_fill_text(page, date_parts):
+            await page.fill(f"#{part_id}", dict(date_parts)[part_id])
 
         # ---------- Disability status ----------
         if "disability_status" in data:
             status_lbl = data["disability_status"]
             await page.get_by_label(status_lbl, exact=True).check()
-            print(f"♿ Disability status selected: {status_lbl}")
         else:
             raise ValueError("Missing 'disability_status' in step5 config")
 
+        # One record for the whole page instead of a line per field
+        logger.info(
+            "📊 Step 5 fields\n   👤 Name: %s\n   📅 Date: %s/%s/%s\n   ♿ Disability status: %s",
+            data["name"], date_vals["month"], date_vals["day"], date_vals["year"], status_lbl,
+        )
+
         # ---------- Continue ----------
         await page.click('button[data-automation-id="pageFooterNextButton"]')
-        await page.wait_for_timeout(1000)
+        await page.wait_for_load_state("domcontentloaded")
         print("✅ Step 5 completed.")
         return True
 
     except Exception as err:
-        print(f"❌ Step 5 failed: {err}")
-        try:
-            await page.screenshot(path="step5_self_identify_error.png")
-        except:
-            pass
+        logger.error("❌ Step 5 failed: %s", err)
+        capture_failure(page, "step5_self_identify_error.png", debug_only=True)
         return False